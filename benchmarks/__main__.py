@@ -0,0 +1,225 @@
+"""
+Run the benchmarks without asv and compare the results with a baseline.
+
+asv builds a fresh environment for every commit it measures, which needs
+network access.  This runner times the same benchmark classes in the current
+interpreter, against the datashape that is importable from it, so it works
+offline and in a plain checkout::
+
+    python -m benchmarks run                  # print the timings
+    python -m benchmarks run --save before    # ... and store them
+    python -m benchmarks compare before       # time again and compare
+    python -m benchmarks compare before after # compare two stored runs
+
+Stored runs are JSON files in ``benchmarks/baselines``.  ``-b`` selects the
+benchmarks whose names match a regular expression, as with ``asv run -b``.
+``compare`` exits with status 1 when a benchmark got slower by more than the
+``--factor`` (1.1 by default), so it can gate a change.
+
+asv itself can run offline too, in the current environment::
+
+    asv run --python=same --set-commit-hash=$(git rev-parse HEAD)
+    asv compare <commit> <commit>
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import gc
+import inspect
+import json
+import os
+import pkgutil
+import platform
+import re
+import subprocess
+import sys
+import textwrap
+import timeit
+from importlib import import_module
+
+
+here = os.path.dirname(os.path.abspath(__file__))
+baselines = os.path.join(here, 'baselines')
+
+# The kinds of benchmark asv knows, by method prefix
+prefixes = 'time_', 'timeraw_', 'track_'
+
+
+def collect(pattern=None):
+    """ Yield ``(name, class, method name)`` of the benchmarks in this
+    package, in the order of their names """
+    benchmarks = []
+    for _, modname, _ in pkgutil.iter_modules([here]):
+        if not modname.startswith('bench_'):
+            continue
+        module = import_module('%s.%s' % (__package__, modname))
+        for clsname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for attr in dir(cls):
+                if attr.startswith(prefixes):
+                    name = '%s.%s.%s' % (modname, clsname, attr)
+                    if pattern is None or re.search(pattern, name):
+                        benchmarks.append((name, cls, attr))
+    return sorted(benchmarks, key=lambda b: b[0])
+
+
+def measure(cls, attr):
+    """ Run one benchmark and return ``(value, unit)``
+
+    Timings are the best of ``repeat`` rounds, in seconds per call, and
+    ``setup`` and ``teardown`` run around each round as in asv.
+    """
+    instance = cls()
+    repeat = getattr(cls, 'repeat', 0) or 3
+    number = getattr(cls, 'number', 0)
+    if attr.startswith('timeraw_'):
+        code = textwrap.dedent(getattr(instance, attr)())
+        timer = timeit.default_timer
+        best = float('inf')
+        for _ in range(repeat):
+            start = timer()
+            subprocess.check_call([sys.executable, '-c', code])
+            best = min(best, timer() - start)
+        return best, 'seconds'
+
+    best = float('inf')
+    for _ in range(repeat):
+        if hasattr(instance, 'setup'):
+            instance.setup()
+        try:
+            method = getattr(instance, attr)
+            if attr.startswith('track_'):
+                return method(), getattr(cls, 'unit', 'unit')
+            timer = timeit.Timer(method)
+            if not number:
+                # Enough calls to take a fifth of a second, as in asv
+                number = 1
+                while timer.timeit(number) < 0.2:
+                    number *= 10
+            gc.collect()
+            best = min(best, timer.timeit(number) / number)
+        finally:
+            if hasattr(instance, 'teardown'):
+                instance.teardown()
+    return best, 'seconds'
+
+
+def run(pattern=None, verbose=True):
+    """ Run the selected benchmarks and return ``{name: result}`` """
+    results = {}
+    for name, cls, attr in collect(pattern):
+        try:
+            value, unit = measure(cls, attr)
+        except Exception as e:
+            value, unit = None, '%s: %s' % (type(e).__name__, e)
+        results[name] = {'value': value, 'unit': unit}
+        if verbose:
+            print('%-64s %s' % (name, format_result(results[name])))
+    return results
+
+
+def format_result(result):
+    value, unit = result['value'], result['unit']
+    if value is None:
+        return 'failed (%s)' % unit
+    if unit != 'seconds':
+        return '%s %s' % (value, unit)
+    for scale, suffix in ((1, 's'), (1e-3, 'ms'), (1e-6, 'us')):
+        if value >= scale:
+            return '%.3g%s' % (value / scale, suffix)
+    return '%.3gns' % (value / 1e-9)
+
+
+def machine():
+    return {'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'python': platform.python_version()}
+
+
+def path(name):
+    return os.path.join(baselines, name + '.json')
+
+
+def save(name, results):
+    if not os.path.isdir(baselines):
+        os.makedirs(baselines)
+    with open(path(name), 'w') as f:
+        json.dump({'machine': machine(), 'results': results}, f,
+                  indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load(name):
+    with open(path(name)) as f:
+        return json.load(f)
+
+
+def compare(before, after, factor=1.1):
+    """ Print the change of each benchmark in both runs and return the names
+    of those that got worse by more than ``factor`` """
+    worse = []
+    print('%-64s %10s %10s %7s' % ('benchmark', 'before', 'after', 'ratio'))
+    for name in sorted(set(before) & set(after)):
+        old, new = before[name], after[name]
+        if old['value'] is None or new['value'] is None:
+            ratio, mark = '', ' failed' if new['value'] is None else ''
+        else:
+            ratio = new['value'] / old['value'] if old['value'] else 1.0
+            mark = ''
+            if ratio > factor:
+                mark = ' worse'
+            elif ratio < 1 / factor:
+                mark = ' better'
+            ratio = '%.2f' % ratio
+        if mark in (' worse', ' failed'):
+            worse.append(name)
+        print('%-64s %10s %10s %7s%s' % (name, format_result(old),
+                                         format_result(new), ratio, mark))
+    return worse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--save', metavar='NAME',
+                            help='store the results as a baseline')
+    compare_parser = commands.add_parser(
+        'compare', help='compare with a stored baseline')
+    compare_parser.add_argument('before', help='the stored baseline')
+    compare_parser.add_argument('after', nargs='?',
+                                help='a stored run, instead of running now')
+    compare_parser.add_argument('--factor', type=float, default=1.1,
+                                help='the ratio that counts as a change')
+    for p in run_parser, compare_parser:
+        p.add_argument('-b', '--bench', metavar='REGEX',
+                       help='only the benchmarks whose name matches')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.bench)
+        if args.save:
+            save(args.save, results)
+        return 0
+    if args.command == 'compare':
+        before = load(args.before)
+        if before['machine'] != machine():
+            print('warning: %s was measured on a different machine or Python'
+                  % args.before, file=sys.stderr)
+        if args.after:
+            after = load(args.after)['results']
+        else:
+            after = run(args.bench, verbose=False)
+        if args.bench:
+            after = dict((k, v) for k, v in after.items()
+                         if re.search(args.bench, k))
+        return 1 if compare(before['results'], after, args.factor) else 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Benchmarks for converting datashapes to NumPy dtypes and to text.
+"""
+
+import numpy as np
+
+from datashape import (DataShape, Fixed, Record, dshape, from_numpy, int32,
+                       pprint, string, to_numpy, to_numpy_dtype)
+
+from .bench_parser import nested_string, wide_record_string
+
+
+# Field types that all have a NumPy equivalent
+numpy_types = 'int32', 'float64', 'string[16]', 'datetime', '3 * int8'
+
+
+class WideRecordConversion(object):
+    """Convert a 1,000 field tabular schema."""
+
+    def setup(self):
+        self.ds = dshape(wide_record_string(1000, '1000', numpy_types))
+        self.measure = self.ds.measure
+        self.dtype = to_numpy_dtype(self.measure)
+
+    def time_to_numpy_dtype(self):
+        to_numpy_dtype(self.measure)
+
+    def time_to_numpy(self):
+        to_numpy(self.ds)
+
+    def time_from_numpy(self):
+        from_numpy((1000,), self.dtype)
+
+    def time_str(self):
+        str(self.ds)
+
+    def time_pprint(self):
+        pprint(self.ds)
+
+
+class NestedConversion(object):
+    """Convert a schema nested 50 levels deep."""
+
+    def setup(self):
+        self.ds = dshape(nested_string(50))
+
+    def time_str(self):
+        str(self.ds)
+
+    def time_pprint(self):
+        pprint(self.ds)
+
+    def time_pprint_narrow(self):
+        pprint(self.ds, width=20)
+
+
+class DeepConversion(object):
+    """Print records nested 300 levels deep, too deep for the parser."""
+
+    def setup(self):
+        self.ds = DataShape(int32)
+        for i in range(300):
+            self.ds = DataShape(Fixed(i + 1), Record([('a', self.ds),
+                                                      ('b', string)]))
+
+    def time_pprint(self):
+        pprint(self.ds)
+
+
+class ScalarConversion(object):
+    """Convert the NumPy scalar dtypes back and forth."""
+
+    def setup(self):
+        self.dtypes = [np.dtype(c) for c in '?bhilqBHILQefdFD'] * 50
+        self.dtypes += [np.dtype('M8[us]'), np.dtype('m8[s]')] * 50
+        self.measures = [from_numpy((), dt).measure for dt in self.dtypes]
+
+    def time_from_numpy(self):
+        for dt in self.dtypes:
+            from_numpy((), dt)
+
+    def time_to_numpy_dtype(self):
+        for measure in self.measures:
+            to_numpy_dtype(measure)
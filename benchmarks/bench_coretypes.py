@@ -0,0 +1,35 @@
+"""
+Benchmarks for operations on datashape types.
+"""
+
+from datashape import DataShape, Record, int32, var
+
+
+class WideRecordProjection(object):
+    """Select columns from a 10,000 field record."""
+
+    def setup(self):
+        self.ds = DataShape(var, Record([('f%d' % i, int32)
+                                         for i in range(10000)]))
+        self.columns = ['f%d' % i for i in range(0, 10000, 10)]
+
+    def time_subshape_names(self):
+        self.ds.subshape[:, self.columns]
+
+    def time_getitem(self):
+        record = self.ds.measure
+        for name in self.columns:
+            record[name]
+
+
+class BatchSubshape(object):
+    """Evaluate the same 1,000 index expressions against a table."""
+
+    def setup(self):
+        self.ds = DataShape(var, Record([('f%d' % i, int32)
+                                         for i in range(100)]))
+        self.indices = [(slice(0, i % 10), 'f%d' % (i % 100))
+                        for i in range(1000)]
+
+    def time_subshapes(self):
+        self.ds.subshapes(self.indices)
@@ -0,0 +1,50 @@
+"""
+Benchmarks for discovering the datashapes of Python data.
+"""
+
+from datashape import discover
+
+
+class DiscoverRows(object):
+    """Discover the datashape of a million rows."""
+
+    timeout = 300
+    repeat = 1
+    number = 1
+
+    def setup(self):
+        self.integers = list(range(1000000))
+        self.tuples = [(1, 'Alice', 100.5), (2, 'Bob', -2.0)] * 500000
+
+    def time_discover_integers(self):
+        discover(self.integers)
+
+    def time_discover_tuples(self):
+        discover(self.tuples)
+
+
+class DiscoverStrings(object):
+    """Discover 10,000 strings, each of which is tried as a date."""
+
+    def setup(self):
+        self.dates = ['2014-01-%02d' % (i % 28 + 1) for i in range(10000)]
+        self.names = ['Alice', 'Bob', 'Charlie', 'Dennis'] * 2500
+
+    def time_discover_dates(self):
+        discover(self.dates)
+
+    def time_discover_names(self):
+        discover(self.names)
+
+
+class DiscoverRecords(object):
+    """Discover 10,000 nested dictionaries."""
+
+    def setup(self):
+        row = {'id': 1, 'name': 'Alice',
+               'address': {'street': '1 Main St', 'zip': 12345},
+               'scores': [1.0, 2.5, 3.0]}
+        self.rows = [row] * 10000
+
+    def time_discover_records(self):
+        discover(self.rows)
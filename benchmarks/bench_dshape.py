@@ -0,0 +1,23 @@
+"""
+Benchmarks for building datashapes with ``dshape``.
+"""
+
+from datashape import Record, dshape, int32, var
+
+
+def wide_record(n):
+    return Record([('f%d' % i, var * int32) for i in range(n)])
+
+
+class WideRecord(object):
+    """Wrap a 10,000 field record in a datashape."""
+
+    def setup(self):
+        self.record = wide_record(10000)
+        dshape(self.record)
+
+    def time_dshape_validated(self):
+        dshape(self.record)
+
+    def time_dshape_unvalidated(self):
+        dshape(wide_record(10000))
@@ -0,0 +1,23 @@
+"""
+Benchmarks for the time taken to import datashape in a new interpreter.
+"""
+
+
+class ImportTime(object):
+    """Start an interpreter and import datashape, as a command line tool
+    would."""
+
+    def timeraw_import(self):
+        return 'import datashape'
+
+    def timeraw_import_and_parse(self):
+        return """
+        import datashape
+        datashape.dshape('var * {name: string, amount: ?float64}')
+        """
+
+    def timeraw_import_and_discover(self):
+        return """
+        import datashape
+        datashape.discover([{'name': 'Alice', 'amount': 100.0}])
+        """
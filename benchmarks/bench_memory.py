@@ -0,0 +1,49 @@
+"""
+Benchmarks for the memory held by datashape objects.
+"""
+
+import gc
+import tracemalloc
+
+from datashape import (DataShape, Fixed, Function, Option, Record, String,
+                       Tuple, float64, int32, var)
+
+
+def mixed_schemas(n):
+    """ ``n`` distinct schemas of the kinds found in a typical catalog """
+    schemas = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            schema = DataShape(var, Record([('id', int32),
+                                            ('name', String(i % 64 + 1)),
+                                            ('amount', Option(float64))]))
+        elif kind == 1:
+            schema = DataShape(Fixed(i), Fixed(3), float64)
+        elif kind == 2:
+            schema = Tuple([DataShape(Fixed(i), int32), String(i % 64 + 1)])
+        else:
+            schema = Function(DataShape(Fixed(i), int32), Option(float64))
+        schemas.append(schema)
+    return schemas
+
+
+class MixedSchemaMemory(object):
+    """Memory retained by 100,000 mixed schemas, as seen by tracemalloc."""
+
+    unit = 'bytes'
+    number = 1
+    repeat = 1
+
+    def track_tracemalloc_mixed_schemas(self):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            schemas = mixed_schemas(100000)
+            hash(tuple(schemas))  # hashes are cached on the instances
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del schemas
+        return size
@@ -0,0 +1,57 @@
+"""
+Benchmarks for parsing datashape strings.
+"""
+
+from datashape import dshape
+from datashape.parser import parse
+from datashape.type_symbol_table import sym
+
+
+def wide_record_string(n, dim='var', types=('int32', '?float64', 'string',
+                                            'datetime', '3 * int8')):
+    """ A tabular schema with ``n`` fields of assorted ``types`` """
+    fields = ('f%d: %s' % (i, types[i % len(types)]) for i in range(n))
+    return '%s * {%s}' % (dim, ', '.join(fields))
+
+
+def nested_string(depth):
+    """ Records, options and dimensions nested ``depth`` levels deep """
+    text = 'int32'
+    for i in range(depth):
+        text = '%s * {a%d: ?%s, b%d: string}' % (i % 4 + 1, i, text, i)
+    return text
+
+
+class ParseWideRecord(object):
+    """Parse a 1,000 field tabular schema."""
+
+    def setup(self):
+        self.text = wide_record_string(1000)
+
+    def time_parse(self):
+        parse(self.text, sym)
+
+    def time_dshape(self):
+        dshape(self.text)
+
+
+class ParseNested(object):
+    """Parse a schema nested 50 levels deep."""
+
+    def setup(self):
+        self.text = nested_string(50)
+
+    def time_parse(self):
+        parse(self.text, sym)
+
+
+class ParseMany(object):
+    """Parse the short schemas a catalog is full of, one at a time."""
+
+    def setup(self):
+        self.texts = ['%d * {id: int64, name: string[%d], amount: ?float64}'
+                      % (i, i % 32 + 1) for i in range(1000)]
+
+    def time_parse(self):
+        for text in self.texts:
+            parse(text, sym)
@@ -0,0 +1,28 @@
+"""
+Benchmarks for pickling datashapes, as when sending them to other processes.
+"""
+
+import pickle
+
+from datashape import dshape
+
+from .bench_parser import wide_record_string
+
+
+class PickleWideRecord(object):
+    """Pickle a 1,000 field tabular schema."""
+
+    unit = 'bytes'
+
+    def setup(self):
+        self.ds = dshape(wide_record_string(1000))
+        self.pickled = pickle.dumps(self.ds, pickle.HIGHEST_PROTOCOL)
+
+    def time_dumps(self):
+        pickle.dumps(self.ds, pickle.HIGHEST_PROTOCOL)
+
+    def time_loads(self):
+        pickle.loads(self.pickled)
+
+    def track_pickled_size(self):
+        return len(self.pickled)
@@ -0,0 +1,32 @@
+"""
+Benchmarks for the predicates in datashape.predicates.
+"""
+
+from datashape import dshape
+from datashape.predicates import (isfixed, ishomogeneous, isnumeric,
+                                  isrecord, isscalar, istabular)
+
+
+class PredicatesOnSchema(object):
+    """Ask a planner's usual questions about the same schema 1,000 times."""
+
+    def setup(self):
+        self.text = 'var * {name: string, amounts: 10 * ?float64, id: int64}'
+        self.ds = dshape(self.text)
+
+    def time_predicates(self):
+        ds = self.ds
+        for _ in range(1000):
+            istabular(ds)
+            isfixed(ds)
+            ishomogeneous(ds)
+            isrecord(ds.measure)
+            isscalar(ds.measure)
+            isnumeric(ds)
+
+    def time_predicates_on_strings(self):
+        text = self.text
+        for _ in range(1000):
+            istabular(text)
+            isfixed(text)
+            ishomogeneous(text)
@@ -0,0 +1,43 @@
+"""
+Benchmarks for promoting datashapes.
+"""
+
+from datashape import (Option, bool_, dshape, float32, float64, int8, int16,
+                       int32, int64, promote, promote_many, uint8, uint32)
+
+
+class PromotePairs(object):
+    """Promote the handful of pairs an expression compiler sees all day."""
+
+    def setup(self):
+        self.pairs = [(int32, int64),
+                      (int64, float32),
+                      (Option(int32), float64),
+                      (float32, Option(float64))] * 250
+
+    def time_promote(self):
+        for lhs, rhs in self.pairs:
+            promote(lhs, rhs)
+
+
+class PromoteStorm(object):
+    """Fold promote over the types of 100,000 values and over 1,000 table
+    schemas, as when merging the schemas of many files."""
+
+    def setup(self):
+        scalars = [int8, int16, int32, int64, uint8, uint32, float32, float64,
+                   bool_]
+        scalars += [Option(t) for t in scalars]
+        self.types = [scalars[i * 7 % len(scalars)] for i in range(100000)]
+        self.schemas = [
+            dshape('%d * {id: %s, amount: %s, name: %s}'
+                   % (i % 10 + 1, scalars[i % len(scalars)],
+                      scalars[i * 3 % len(scalars)],
+                      '?string' if i % 5 else 'string'))
+            for i in range(1000)]
+
+    def time_promote_many(self):
+        promote_many(self.types)
+
+    def time_promote_many_structural(self):
+        promote_many(self.schemas, structural=True)
@@ -0,0 +1,52 @@
+"""
+Benchmarks for type set membership and the predicates built on it.
+"""
+
+from datashape import (Option, SignatureIndex, TypeSet, bool_, float32,
+                       float64, int32, int64, string)
+from datashape.predicates import isboolean, isreal
+from datashape.typesets import (floating, integral, matches_typeset, real,
+                                scalar)
+
+
+class TypeSetMembership(object):
+    """Check 1,000 measures against the builtin type sets."""
+
+    def setup(self):
+        self.measures = [int32, float64, Option(float32), bool_, string] * 200
+
+    def time_matches_typeset(self):
+        for measure in self.measures:
+            matches_typeset(measure, scalar)
+
+    def time_contains(self):
+        for measure in self.measures:
+            measure in real
+
+    def time_isreal(self):
+        for measure in self.measures:
+            isreal(measure)
+
+    def time_isboolean(self):
+        for measure in self.measures:
+            isboolean(measure)
+
+
+class ResolveSignatures(object):
+    """Resolve argument types against 200 overloaded signatures."""
+
+    def setup(self):
+        self.signatures = [(TypeSet(int64, float64), integral, floating)] * 199
+        self.signatures.append((real, real, real))
+        self.index = SignatureIndex(self.signatures)
+        self.args = (int32, int32, float32)
+
+    def time_linear_matches_typeset(self):
+        [s for s in self.signatures if matches_typeset(self.args, s)]
+
+    def time_index_resolve(self):
+        self.index._cache.clear()
+        self.index.resolve(self.args)
+
+    def time_index_resolve_cached(self):
+        self.index.resolve(self.args)
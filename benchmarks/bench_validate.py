@@ -0,0 +1,33 @@
+"""
+Benchmarks for validating values against datashapes.
+"""
+
+from datetime import date
+
+from datashape import dshape, validate, compile_validator
+
+
+class ValidateRecords(object):
+    """Validate a million records against a tabular schema."""
+
+    timeout = 300
+    repeat = 1
+    number = 1
+
+    def setup(self):
+        self.schema = dshape('var * {name: string, amount: float64, '
+                             'when: date}')
+        self.rows = [
+            {'name': 'Alice', 'amount': 100.0, 'when': date(2014, 1, 1)},
+            {'name': 'Bob', 'amount': -2.5, 'when': date(2015, 6, 30)},
+        ] * 500000
+        self.is_valid = compile_validator(self.schema)
+
+    def time_validate(self):
+        validate(self.schema, self.rows)
+
+    def time_compiled_validator(self):
+        self.is_valid(self.rows)
+
+    def time_compile_validator(self):
+        compile_validator(self.schema)
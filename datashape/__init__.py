@@ -1,16 +1,43 @@
 from __future__ import absolute_import
 
+import sys
+
 from . import lexer, parser
 from .coretypes import *
 from .predicates import *
 from .typesets import *
 from .user import *
 from .type_symbol_table import *
-from .discovery import discover
 from .util import *
-from .promote import promote, optionify
+from .promote import promote, promote_many, optionify
 from .error import DataShapeSyntaxError
 
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+if sys.version_info >= (3, 7):
+    # Discovery and the version are loaded on first use. Discovery registers
+    # many functions and the version may run git, and neither is needed to
+    # parse and compare datashapes
+    def __getattr__(name):
+        global __version__
+        if name in ('discover', 'discover_stats', 'discovery'):
+            import datashape.discovery as discovery
+            globals().update(discover=discovery.discover,
+                             discover_stats=discovery.discover_stats)
+            return globals()[name]
+        if name == '__version__':
+            from ._version import get_versions
+            __version__ = get_versions()['version']
+            return __version__
+        raise AttributeError('module %r has no attribute %r' % (__name__,
+                                                                name))
+else:
+    from .discovery import discover, discover_stats
+
+    from ._version import get_versions
+    __version__ = get_versions()['version']
+    del get_versions
+
+del sys
+
+# Star imports go through ``__getattr__`` for the names loaded on first use
+__all__ = sorted(set(name for name in globals() if not name.startswith('_')) |
+                 set(['discover', 'discover_stats', 'discovery']))
@@ -11,6 +11,7 @@ import sys
 import ctypes
 import operator
 
+from functools import wraps
 from math import ceil
 
 import datashape
@@ -22,10 +23,11 @@ from .py2help import (
     _inttypes,
     _strtypes,
     basestring,
+    mappingproxy,
     unicode,
     with_metaclass,
 )
-from .internal_utils import IndexCallable, isidentifier
+from .internal_utils import IndexCallable, LRUCache, isidentifier
 
 
 # Classes of unit types.
@@ -33,11 +35,63 @@ DIMENSION = 1
 MEASURE = 2
 
 
+def _parameter_getter(slots):
+    """ A function returning the values of ``slots`` as a tuple
+
+    >>> _parameter_getter(('start', 'stop'))(slice(1, 2))
+    (1, 2)
+    >>> _parameter_getter(('start',))(slice(1, 2))
+    (1,)
+    """
+    if not slots:
+        return lambda self: ()
+    elif len(slots) == 1:
+        getter = operator.attrgetter(slots[0])
+        return lambda self: (getter(self),)
+    else:
+        return operator.attrgetter(*slots)
+
+
+def _memoize_text(method, index):
+    """ Wrap ``__str__`` or ``__repr__`` to store its result at ``index`` of
+    the instance's ``_text`` """
+    @wraps(method)
+    def memoized(self):
+        try:
+            texts = self._text
+        except AttributeError:
+            texts = self._text = [None, None]
+        text = texts[index]
+        if text is None:
+            text = texts[index] = method(self)
+        return text
+    memoized._memoized = True
+    return memoized
+
+
 class Type(type):
     _registry = {}
 
     def __new__(meta, name, bases, dct):
+        # Unless a class says otherwise, the slots it declares hold its
+        # parameters, see ``Mono.parameters``
+        if '__slots__' in dct and '_parameter_slots' not in dct:
+            slots = dct['__slots__']
+            if isinstance(slots, _strtypes):
+                slots = slots,
+            dct['_parameter_slots'] = tuple(slots)
+        if dct.get('_parameter_slots') is not None:
+            dct['_get_parameters'] = staticmethod(
+                _parameter_getter(dct['_parameter_slots']))
         cls = super(Type, meta).__new__(meta, name, bases, dct)
+        # Types are immutable, so their text is built once, see ``Mono._text``
+        if hasattr(cls, '_text'):
+            for index, method in enumerate(('__str__', '__repr__')):
+                owner = next(c for c in cls.__mro__ if method in vars(c))
+                func = vars(owner)[method]
+                if owner is not object and not getattr(func, '_memoized',
+                                                       False):
+                    setattr(cls, method, _memoize_text(func, index))
         # Don't register abstract classes
         if not dct.get('abstract'):
             Type._registry[name] = cls
@@ -67,6 +121,19 @@ class Mono(with_metaclass(Type, object)):
         type(datashape_type)(*type.parameters)
     """
 
+    # ``_validated`` is set once an instance passes
+    # ``datashape.validation.validate``, ``_predicates`` caches the results of
+    # the functions in ``datashape.predicates`` and ``_text`` caches the
+    # ``str`` and ``repr`` of the instance
+    __slots__ = '_parameters', '_hash', '_validated', '_predicates', '_text'
+
+    # The names of the slots holding the parameters, or ``None`` when they
+    # are stored as a tuple in ``_parameters``
+    _parameter_slots = None
+
+    # The slots caching values derived from the parameters
+    _caches = '_hash', '_predicates', '_text'
+
     composite = False
 
     def __init__(self, *params):
@@ -74,14 +141,13 @@ class Mono(with_metaclass(Type, object)):
 
     @property
     def _slotted(self):
-        return hasattr(self, '__slots__')
+        return self._parameter_slots is not None
 
     @property
     def parameters(self):
-        if self._slotted:
-            return tuple(getattr(self, slot) for slot in self.__slots__)
-        else:
+        if self._parameter_slots is None:
             return self._parameters
+        return self._get_parameters(self)
 
     def info(self):
         return type(self), self.parameters
@@ -117,7 +183,7 @@ class Mono(with_metaclass(Type, object)):
             ', '.join(
                 (
                     '%s=%r' % (slot, getattr(self, slot))
-                    for slot in self.__slots__
+                    for slot in self._parameter_slots
                 ) if self._slotted else
                 map(repr, self.parameters),
             ),
@@ -159,15 +225,48 @@ class Mono(with_metaclass(Type, object)):
 
         return DataShape(other, self)
 
-    def __getstate__(self):
-        return self.parameters
+    @classmethod
+    def _from_parameters(cls, parameters):
+        """ Build an instance from the parameters of an existing one
 
-    def __setstate__(self, state):
+        For internal use, e.g. when unpickling, as it skips the checks and
+        side effects of ``__init__``.
+        """
+        ds = object.__new__(cls)
+        ds._set_parameters(parameters)
+        return ds
+
+    def _set_parameters(self, parameters):
         if self._slotted:
-            for slot, val in zip(self.__slots__, state):
+            for slot, val in zip(self._parameter_slots, parameters):
                 setattr(self, slot, val)
         else:
-            self._parameters = state
+            self._parameters = parameters
+
+    def __reduce__(self):
+        # Instances bound to module level names, such as ``int32``, are
+        # pickled by name so that they unpickle to the same instance
+        named = _pickled_by_name.get((type(self), self))
+        if named is None:
+            return self._reduce_parameters()
+        name, ds = named
+        return name if ds is self else (_canonical, (ds,))
+
+    def _reduce_parameters(self):
+        return _restore, (type(self),) + self.parameters
+
+    # Pickles made before ``__reduce__`` restore their state with these
+    def __getstate__(self):
+        return self.parameters
+
+    def __setstate__(self, state):
+        self._set_parameters(state)
+        # Forget what was cached about the previous state
+        for slot in self._caches:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                pass
 
     def to_numpy_dtype(self):
         raise TypeError('DataShape %s is not NumPy-compatible' % self)
@@ -178,6 +277,11 @@ class Unit(Mono):
     """
     Unit type that does not need to be reconstructed.
     """
+    __slots__ = ()
+    _parameter_slots = None
+
+    # Units have no components, so they are always well-formed
+    _validated = True
 
     def __str__(self):
         return type(self).__name__.lower()
@@ -208,7 +312,7 @@ class Ellipsis(Mono):
 class Null(Unit):
 
     """The null datashape."""
-    pass
+    __slots__ = ()
 
 
 class Date(Unit):
@@ -537,7 +641,11 @@ class DataShape(Mono):
     --------
     datashape.dshape
     """
-    composite = False
+    __slots__ = 'name', '_subarrays'
+    _parameter_slots = None
+    _caches = Mono._caches + ('_subarrays',)
+
+    composite = True
 
     def __init__(self, *parameters, **kwds):
         if len(parameters) == 1 and isinstance(parameters[0], _strtypes):
@@ -559,12 +667,25 @@ class DataShape(Mono):
         else:
             raise ValueError('the data shape should be constructed from 2 or'
                              ' more parameters, only got %s' % len(parameters))
-        self.composite = True
         self.name = kwds.get('name')
 
         if self.name:
             type(type(self))._registry[self.name] = self
 
+    @classmethod
+    def _from_parameters(cls, parameters, validated=False):
+        """ Build a DataShape from a tuple of already laundered parameters
+
+        For internal use when ``parameters`` are taken from an existing
+        datashape, so the checks done by ``__init__`` would be redundant.
+        """
+        ds = object.__new__(cls)
+        ds._parameters = parameters
+        ds.name = None
+        if validated:
+            ds._validated = True
+        return ds
+
     def __len__(self):
         return len(self.parameters)
 
@@ -599,22 +720,79 @@ class DataShape(Mono):
         >>> dshape('1 * 2 * 3 * int32').subarray(2)
         dshape("3 * int32")
         """
-        if leading >= len(self.parameters):
+        try:
+            return self._subarrays[leading]
+        except AttributeError:
+            self._subarrays = {}
+        except KeyError:
+            pass
+
+        parameters = self.parameters
+        if leading >= len(parameters):
             raise IndexError('Not enough dimensions in data shape '
                              'to remove %d leading dimensions.' % leading)
-        elif leading in [len(self.parameters) - 1, -1]:
-            return DataShape(self.parameters[-1])
+        elif leading in [len(parameters) - 1, -1]:
+            parameters = parameters[-1:]
         else:
-            return DataShape(*self.parameters[leading:])
+            parameters = parameters[leading:]
+        # Trailing dimensions of a valid datashape are themselves valid
+        result = self._subarrays[leading] = DataShape._from_parameters(
+            parameters, validated=getattr(self, '_validated', False))
+        return result
 
     def __rmul__(self, other):
         if isinstance(other, _inttypes):
             other = Fixed(other)
+        if (isinstance(other, Mono) and not isinstance(other, DataShape) and
+                getattr(other, 'cls', DIMENSION) == DIMENSION):
+            return DataShape._from_parameters((other,) + self.parameters)
         return DataShape(other, *self)
 
+    def __hash__(self):
+        try:
+            h = self._hash
+        except AttributeError:
+            # Equivalent to Mono.__hash__, but reuses the hash cached on the
+            # measure instead of hashing its parameters again
+            measure = self.measure
+            h = self._hash = (hash(self.shape) ^ hash(measure) ^
+                              hash(measure.shape))
+        return h
+
     @property
     def subshape(self):
-        return IndexCallable(self._subshape)
+        return IndexCallable(self._cached_subshape)
+
+    def subshapes(self, indices):
+        """ The DataShapes of many indexed subarrays at once
+
+        Equivalent to ``[ds.subshape[index] for index in indices]``.  Results,
+        including intermediate results for multidimensional indices, are
+        shared through a cache keyed on the datashape and index, so repeated
+        and overlapping indices are computed once.
+
+        >>> from datashape import dshape
+        >>> ds = dshape('var * {name: string, amount: int32, id: int32}')
+        >>> for sub in ds.subshapes([0, (slice(0, 10), 'amount'),
+        ...                          (slice(None), ['name', 'id'])]):
+        ...     print(sub)
+        {name: string, amount: int32, id: int32}
+        10 * int32
+        var * {name: string, id: int32}
+        """
+        subshape = self._cached_subshape
+        return [subshape(index) for index in indices]
+
+    def _cached_subshape(self, index):
+        try:
+            key = self, _normalize_index(index)
+            return _subshape_cache[key]
+        except TypeError:  # unhashable index, e.g. a NumPy array
+            return self._subshape(index)
+        except KeyError:
+            pass
+        result = _subshape_cache[key] = self._subshape(index)
+        return result
 
     def _subshape(self, index):
         """ The DataShape of an indexed subarray
@@ -663,7 +841,7 @@ class DataShape(Mono):
         if isinstance(self[0], Record) and isinstance(index, list):
             rec = self[0]
             # Translate strings to corresponding integers
-            index = [self[0].names.index(i) if isinstance(i, _strtypes) else i
+            index = [rec._field_index(i) if isinstance(i, _strtypes) else i
                      for i in index]
             return DataShape(Record([rec.parameters[0][i] for i in index]))
         if isinstance(self[0], Record) and isinstance(index, slice):
@@ -700,21 +878,48 @@ class DataShape(Mono):
             if not index:
                 return self
             elif index[0] is None:
-                return 1 * self._subshape(index[1:])
+                return 1 * self._cached_subshape(index[1:])
             elif len(index) == 1:
-                return self._subshape(index[0])
+                return self._cached_subshape(index[0])
             else:
-                ds = self.subarray(1)._subshape(index[1:])
-                return (self[0] * ds)._subshape(index[0])
+                ds = self.subarray(1)._cached_subshape(index[1:])
+                return (self[0] * ds)._cached_subshape(index[0])
         raise TypeError('invalid index value %s of type %r' %
                         (index, type(index).__name__))
 
     def __setstate__(self, state):
-        self._parameters = state
-        self.composite = True
+        super(DataShape, self).__setstate__(state)
         self.name = None
 
 
+# Subshapes of recently indexed datashapes, see DataShape.subshapes
+_subshape_cache = LRUCache(4096)
+
+
+def _normalize_index(index):
+    """ A hashable key equivalent to an index expression
+
+    Scalars are keyed on their type too, as ``1``, ``1.0`` and ``True`` are
+    equal but not equally valid indices.
+
+    >>> key = _normalize_index((slice(0, 10), ['name', 'id']))
+    >>> key == _normalize_index((slice(0, 10), ['name', 'id']))
+    True
+    >>> _normalize_index(1) == _normalize_index(1.0)
+    False
+    """
+    if isinstance(index, slice):
+        return ('slice',) + tuple(map(_normalize_index, (index.start,
+                                                         index.stop,
+                                                         index.step)))
+    if isinstance(index, list):
+        return ('list',) + tuple(map(_normalize_index, index))
+    if isinstance(index, tuple):
+        return tuple(map(_normalize_index, index))
+    hash(index)  # raise TypeError early for unhashable indices
+    return type(index), index
+
+
 numpy_provides_missing = frozenset((Date, DateTime, TimeDelta))
 
 
@@ -883,6 +1088,9 @@ class TypeVar(Unit):
 class Function(Mono):
     """Function signature type
     """
+    __slots__ = ()
+    _parameter_slots = None
+
     @property
     def restype(self):
         return self.parameters[-1]
@@ -939,6 +1147,7 @@ def _launder(x):
 
 
 class CollectionPrinter(object):
+    __slots__ = ()
 
     def __repr__(self):
         s = str(self)
@@ -1035,6 +1244,10 @@ class Record(with_metaclass(RecordMeta, CollectionPrinter, Mono)):
     >>> Record([['id', 'int'], ['name', 'string'], ['amount', 'real']])
     dshape("{id: int32, name: string, amount: float64}")
     """
+    # Lookup tables built from ``fields`` on first use, see ``_index_fields``
+    __slots__ = '_names', '_types', '_dict', '_index'
+    _parameter_slots = None
+
     cls = MEASURE
 
     def __init__(self, fields):
@@ -1059,6 +1272,24 @@ class Record(with_metaclass(RecordMeta, CollectionPrinter, Mono)):
             raise ValueError("duplicate field names found: %s" % names)
 
         self._parameters = tuple(zip(names, types)),
+        self._names = self._types = self._dict = self._index = None
+
+    def _index_fields(self):
+        fields = self.fields
+        self._names = tuple(n for n, t in fields)
+        self._types = tuple(t for n, t in fields)
+        self._dict = dict(fields)
+        self._index = dict((n, i) for i, n in enumerate(self._names))
+
+    def _field_index(self, name):
+        """ The position of the field called ``name`` """
+        if self._index is None:
+            self._index_fields()
+        try:
+            return self._index[name]
+        except KeyError:
+            # The error of ``list.index``, which this replaces
+            raise ValueError('%r is not in list' % (name,))
 
     @property
     def fields(self):
@@ -1066,15 +1297,22 @@ class Record(with_metaclass(RecordMeta, CollectionPrinter, Mono)):
 
     @property
     def dict(self):
-        return dict(self.fields)
+        """ A read-only mapping of field names to types """
+        if self._dict is None:
+            self._index_fields()
+        return mappingproxy(self._dict)
 
     @property
     def names(self):
-        return [n for n, t in self.fields]
+        if self._names is None:
+            self._index_fields()
+        return list(self._names)
 
     @property
     def types(self):
-        return [t for n, t in self.fields]
+        if self._types is None:
+            self._index_fields()
+        return list(self._types)
 
     def to_numpy_dtype(self):
         """
@@ -1084,11 +1322,24 @@ class Record(with_metaclass(RecordMeta, CollectionPrinter, Mono)):
                          for name, typ in self.fields])
 
     def __getitem__(self, key):
-        return self.dict[key]
+        if self._dict is None:
+            self._index_fields()
+        return self._dict[key]
 
     def __str__(self):
         return pprint(self)
 
+    def _set_parameters(self, parameters):
+        super(Record, self)._set_parameters(parameters)
+        self._names = self._types = self._dict = self._index = None
+
+    def _reduce_parameters(self):
+        # Two tuples of types and names pickle smaller than a pair per field.
+        # Types go first, so that the types they share are memoized by the
+        # pickler with small indices
+        names, types = tuple(zip(*self.fields)) or ((), ())
+        return _restore_record, (type(self), types, names)
+
 
 R = Record  # Alias for record literals
 
@@ -1281,6 +1532,43 @@ Type.register('string', String())
 var = Var()
 
 
+# Equal instances, keyed on their type and value, and the names of the
+# module level instances they are pickled as, see ``Mono.__reduce__``
+_pickled_by_name = {}
+
+
+def _pickle_by_name(namespace, names):
+    """ Pickle the instances bound to ``names`` in ``namespace``, the globals
+    of the module defining their class, and any equal instances, by name """
+    for name in names:
+        ds = namespace[name]
+        _pickled_by_name[type(ds), ds] = name, ds
+
+
+_pickle_by_name(globals(), [
+    'bool_', 'char', 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
+    'uint32', 'uint64', 'float16', 'float32', 'float64', 'complex_float32',
+    'complex_float64', 'date_', 'time_', 'datetime_', 'timedelta_', 'null',
+    'void', 'object_', 'NullRecord', 'bytes_', 'string', 'json', 'var',
+])
+
+
+def _restore(cls, *parameters):
+    """ Unpickle an instance of ``cls``, see ``Mono.__reduce__`` """
+    return cls._from_parameters(parameters)
+
+
+def _restore_record(cls, types, names):
+    """ Unpickle a record, see ``Record._reduce_parameters`` """
+    return cls._from_parameters((tuple(zip(names, types)),))
+
+
+def _canonical(ds):
+    """ Unpickle an instance equal to a module level one as that one, see
+    ``Mono.__reduce__`` """
+    return ds
+
+
 def to_numpy_dtype(ds):
     """ Throw away the shape information and just return the
     measure as NumPy dtype instance."""
@@ -1411,36 +1699,84 @@ def pprint(ds, width=80):
       }
     >>>
     '''
-    result = ''
+    layout = _layout(ds, width)[2]
+    if not isinstance(layout, tuple):
+        return layout
+    out = []
+    _render(layout, '', out)
+    return ''.join(out)
+
+
+def _layout(ds, width):
+    """ Measure ``ds`` as ``pprint(ds, width)`` prints it
+
+    Returns the length and the number of line breaks of the text, and either
+    the text itself or, for a record or tuple too wide for one line, its
+    layout for ``_render``: the prefix of dimensions, brackets, field labels
+    and the measurements of the fields.
 
+    Text that fits on one line is shorter than ``width`` and cheap to build
+    eagerly.  Anything wider is only measured here, so that it is built once,
+    by ``_render``, however deeply it is nested.
+    """
+    prefix = ''
     if isinstance(ds, DataShape):
         if ds.shape:
-            result += ' * '.join(map(str, ds.shape))
-            result += ' * '
+            prefix = ' * '.join(map(str, ds.shape)) + ' * '
         ds = ds[-1]
 
     if isinstance(ds, Record):
-        pairs = ['%s: %s' % (name if isidentifier(name) else
-                             repr(print_unicode_string(name)),
-                             pprint(typ, width - len(result) - len(name)))
-                 for name, typ in zip(ds.names, ds.types)]
-        short = '{%s}' % ', '.join(pairs)
-
-        if len(result + short) < width:
-            return result + short
-        else:
-            long = '{\n%s\n}' % ',\n'.join(pairs)
-            return result + long.replace('\n', '\n  ')
-
+        brackets = '{}'
+        labels = ['%s: ' % (name if isidentifier(name) else
+                            repr(print_unicode_string(name)))
+                  for name, _ in ds.fields]
+        fields = [_layout(typ, width - len(prefix) - len(name))
+                  for name, typ in ds.fields]
     elif isinstance(ds, Tuple):
-        typs = [pprint(typ, width-len(result))
-                for typ in ds.dshapes]
-        short = '(%s)' % ', '.join(typs)
-        if len(result + short) < width:
-            return result + short
-        else:
-            long = '(\n%s\n)' % ',\n'.join(typs)
-            return result + long.replace('\n', '\n  ')
+        brackets = '()'
+        labels = [''] * len(ds.dshapes)
+        fields = [_layout(typ, width - len(prefix)) for typ in ds.dshapes]
     else:
-        result += str(ds)
-    return result
+        text = prefix + str(ds)
+        return len(text), text.count('\n'), text
+
+    # The length of the fields on one line, between brackets
+    separators = max(len(fields) - 1, 0)
+    length = (len(prefix) + 2 + 2 * separators + sum(map(len, labels)) +
+              sum(field[0] for field in fields))
+    breaks = sum(field[1] for field in fields)
+    if length < width:
+        # Fields are narrower than the text containing them, so none of them
+        # was laid out over several lines either
+        text = '%s%s%s%s' % (prefix, brackets[0],
+                             ', '.join([label + field[2] for label, field
+                                        in zip(labels, fields)]),
+                             brackets[1])
+        return length, breaks, text
+
+    # Each field and the closing bracket go on a line of their own, and every
+    # line break, including those within fields, is indented
+    breaks += separators + 2
+    length += 2 + 2 * breaks
+    return length, breaks, (prefix, brackets, labels, fields)
+
+
+def _render(layout, indent, out):
+    """ Append the text of a ``layout`` from ``_layout`` to ``out``, with
+    its line breaks followed by ``indent`` """
+    prefix, brackets, labels, fields = layout
+    indent += '  '
+    newline = '\n' + indent
+    out.append(prefix + brackets[0] + newline)
+    separator = ',' + newline
+    for i, (label, field) in enumerate(zip(labels, fields)):
+        if i:
+            out.append(separator)
+        if isinstance(field[2], tuple):
+            out.append(label)
+            _render(field[2], indent, out)
+        elif field[1]:
+            out.append(label + field[2].replace('\n', newline))
+        else:
+            out.append(label + field[2])
+    out.append(newline + brackets[1])
@@ -6,6 +6,7 @@ Do not import datashape modules into this module.  See util.py in that case
 
 from __future__ import print_function, division, absolute_import
 
+from collections import OrderedDict
 import keyword
 import re
 
@@ -29,6 +30,52 @@ class IndexCallable(object):
         return self.fn(key)
 
 
+class LRUCache(object):
+    """ A mapping holding at most ``maxsize`` items, which evicts the least
+    recently used item to make room for new ones
+
+    >>> cache = LRUCache(2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache['a']
+    1
+    >>> cache['c'] = 3
+    >>> 'b' in cache
+    False
+    >>> sorted(cache._data)
+    ['a', 'c']
+    """
+    __slots__ = 'maxsize', '_data'
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __getitem__(self, key):
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data.pop(key, None)
+        data[key] = value
+        if len(data) > self.maxsize:
+            try:
+                data.popitem(last=False)
+            except KeyError:  # emptied concurrently
+                pass
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+
 def remove(predicate, seq):
     return filter(lambda x: not predicate(x), seq)
 
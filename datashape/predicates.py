@@ -1,10 +1,14 @@
+from functools import wraps
+from itertools import count
+
 import numpy as np
 
 from .util import collect, dshape
-from .internal_utils import remove
+from .internal_utils import LRUCache, remove
 from .coretypes import (DataShape, Fixed, Var, Ellipsis, Record, Tuple, Unit,
                         date_, datetime_, TypeVar, to_numpy_dtype, Map,
-                        Option, Categorical)
+                        Option, Categorical, Mono)
+from .py2help import _strtypes
 from .typesets import floating, boolean
 
 # https://github.com/blaze/datashape/blob/master/docs/source/types.rst
@@ -15,7 +19,44 @@ __all__ = ['isdimension', 'ishomogeneous', 'istabular', 'isfixed', 'isscalar',
 
 dimension_types = Fixed, Var, Ellipsis, int
 
-
+# Datashapes parsed from recently seen strings
+_parsed = LRUCache(1024)
+
+# The result of each cached predicate is stored on the type it was asked
+# about, as a two bit code in ``Mono._predicates``
+_predicate_shifts = count(0, 2)
+_result_codes = {False: 1, True: 2}
+_code_results = None, False, True, None
+
+
+def _cached_predicate(predicate):
+    shift = next(_predicate_shifts)
+
+    @wraps(predicate)
+    def cached(ds):
+        if isinstance(ds, _strtypes):
+            try:
+                ds = _parsed[ds]
+            except KeyError:
+                _parsed[ds] = ds = dshape(ds)
+        try:
+            flags = ds._predicates
+        except AttributeError:
+            if not isinstance(ds, Mono):
+                return predicate(ds)
+            flags = 0
+        code = flags >> shift & 3
+        if code:
+            return _code_results[code]
+        result = predicate(ds)
+        code = 3 if result is None else _result_codes.get(result)
+        if code:
+            ds._predicates = flags | code << shift
+        return result
+    return cached
+
+
+@_cached_predicate
 def isscalar(ds):
     """ Is this dshape a single dtype?
 
@@ -33,6 +74,7 @@ def isscalar(ds):
     return isinstance(getattr(ds, 'ty', ds), (Unit, Categorical))
 
 
+@_cached_predicate
 def isrecord(ds):
     """ Is this dshape a record type?
 
@@ -64,6 +106,7 @@ def isdimension(ds):
     return isinstance(ds, dimension_types)
 
 
+@_cached_predicate
 def ishomogeneous(ds):
     """ Does datashape contain only one dtype?
 
@@ -85,6 +128,7 @@ def _dimensions(ds):
     return len(dshape(ds).shape)
 
 
+@_cached_predicate
 def isfixed(ds):
     """ Contains no variable dimensions
 
@@ -109,6 +153,7 @@ def isfixed(ds):
     return True
 
 
+@_cached_predicate
 def istabular(ds):
     """ A collection of records
 
@@ -125,6 +170,7 @@ def istabular(ds):
     return _dimensions(ds) == 1 and isrecord(ds.measure)
 
 
+@_cached_predicate
 def iscollection(ds):
     """ Is a collection of items, has dimension
 
@@ -138,6 +184,7 @@ def iscollection(ds):
     return isdimension(ds[0])
 
 
+@_cached_predicate
 def isnumeric(ds):
     """ Has a numeric measure
 
@@ -168,6 +215,7 @@ def launder(ds):
     return getattr(ds, 'ty', ds)
 
 
+@_cached_predicate
 def isreal(ds):
     """ Has a numeric measure
 
@@ -182,6 +230,7 @@ def isreal(ds):
     return isinstance(ds, Unit) and ds in floating
 
 
+@_cached_predicate
 def isboolean(ds):
     """ Has a boolean measure
 
@@ -195,6 +244,7 @@ def isboolean(ds):
     return launder(ds) in boolean
 
 
+@_cached_predicate
 def isdatelike(ds):
     """ Has a date or datetime measure
 
@@ -3,11 +3,20 @@ from __future__ import absolute_import
 import numpy as np
 import datashape
 
+from .coretypes import DataShape, Fixed, Mono, Option, Record, Tuple, Var, var
+from .dispatch import dispatch
 
-__all__ = ['promote', 'optionify']
 
+__all__ = ['promote', 'promote_many', 'optionify']
 
-def promote(lhs, rhs, promote_option=True):
+
+# Memoized results of promote, keyed on the types and values of both operands
+# and on the options
+_promote_cache = {}
+_promote_cache_size = 10000
+
+
+def promote(lhs, rhs, promote_option=True, structural=False):
     """Promote two scalar dshapes to a possibly larger, but compatible type.
 
     Examples
@@ -32,13 +41,41 @@ def promote(lhs, rhs, promote_option=True):
     >>> promote(x, y, promote_option=False)
     ctype("string")
 
+    With ``structural=True`` dimensions, and the fields of records and tuples,
+    are promoted too.  Fixed dimensions of different lengths promote to var.
+    >>> from datashape import dshape
+    >>> promote(dshape('10 * {a: int32, b: ?float32}'),
+    ...         dshape('var * {a: int64, b: float64}'), structural=True)
+    dshape("var * {a: int64, b: ?float64}")
+
     Notes
     ----
     Except for ``datashape.string`` types, this uses ``numpy.result_type`` for
     type promotion logic.  See the numpy documentation at:
 
     http://docs.scipy.org/doc/numpy/reference/generated/numpy.result_type.html
+
+    Results are memoized, so promoting the same pair again is a dictionary
+    lookup.
     """
+    # Equal operands of different types, e.g. ``Option(int32)`` and
+    # ``dshape('?int32')``, may promote differently
+    key = type(lhs), lhs, type(rhs), rhs, promote_option, structural
+    try:
+        return _promote_cache[key]
+    except KeyError:
+        pass
+    if structural:
+        result = _promote_structure(lhs, rhs, promote_option=promote_option)
+    else:
+        result = _promote(lhs, rhs, promote_option)
+    if len(_promote_cache) >= _promote_cache_size:
+        _promote_cache.clear()
+    _promote_cache[key] = result
+    return result
+
+
+def _promote(lhs, rhs, promote_option):
     if lhs == rhs:
         return lhs
     left, right = getattr(lhs, 'ty', lhs), getattr(rhs, 'ty', rhs)
@@ -54,6 +91,95 @@ def promote(lhs, rhs, promote_option=True):
     return dtype
 
 
+def promote_many(dshapes, promote_option=True, structural=False):
+    """Promote many dshapes to a single type that can hold all of them.
+
+    This folds ``promote`` over ``dshapes`` and takes the same options.
+
+    Examples
+    --------
+    >>> from datashape import dshape, int8, int32, float32, Option
+    >>> promote_many([int8, Option(int32), float32])
+    Option(ty=ctype("float64"))
+    >>> promote_many([dshape('3 * {x: int32, y: int32}'),
+    ...               dshape('5 * {x: int64, y: int32}'),
+    ...               dshape('5 * {x: int32, y: ?int32}')], structural=True)
+    dshape("var * {x: int64, y: ?int32}")
+    """
+    dshapes = iter(dshapes)
+    try:
+        result = next(dshapes)
+    except StopIteration:
+        raise ValueError('promote_many requires at least one dshape')
+    for ds in dshapes:
+        if ds is not result:
+            result = promote(result, ds, promote_option, structural)
+    return result
+
+
+def _promote_dimension(lhs, rhs):
+    if lhs == rhs:
+        return lhs
+    if isinstance(lhs, (Fixed, Var)) and isinstance(rhs, (Fixed, Var)):
+        return var
+    raise TypeError('cannot promote dimensions %s and %s' % (lhs, rhs))
+
+
+@dispatch(DataShape, DataShape)
+def _promote_structure(lhs, rhs, promote_option=True):
+    if len(lhs.shape) != len(rhs.shape):
+        raise TypeError('cannot promote %s and %s, they have a different '
+                        'number of dimensions' % (lhs, rhs))
+    shape = tuple(map(_promote_dimension, lhs.shape, rhs.shape))
+    measure = promote(lhs.measure, rhs.measure, promote_option,
+                      structural=True)
+    return DataShape(*(shape + (measure,)))
+
+
+@dispatch(DataShape, Mono)
+def _promote_structure(lhs, rhs, promote_option=True):
+    return _promote_structure(lhs, DataShape(rhs),
+                              promote_option=promote_option)
+
+
+@dispatch(Mono, DataShape)
+def _promote_structure(lhs, rhs, promote_option=True):
+    return _promote_structure(DataShape(lhs), rhs,
+                              promote_option=promote_option)
+
+
+@dispatch(Record, Record)
+def _promote_structure(lhs, rhs, promote_option=True):
+    if lhs.names != rhs.names:
+        raise TypeError('cannot promote records with different fields: '
+                        '%s and %s' % (lhs, rhs))
+    return Record([(name, promote(a, b, promote_option, structural=True))
+                   for (name, a), b in zip(lhs.fields, rhs.types)])
+
+
+@dispatch(Tuple, Tuple)
+def _promote_structure(lhs, rhs, promote_option=True):
+    if len(lhs.dshapes) != len(rhs.dshapes):
+        raise TypeError('cannot promote tuples of different lengths: '
+                        '%s and %s' % (lhs, rhs))
+    return Tuple([promote(a, b, promote_option, structural=True)
+                  for a, b in zip(lhs.dshapes, rhs.dshapes)])
+
+
+@dispatch(Mono, Mono)
+def _promote_structure(lhs, rhs, promote_option=True):
+    left, right = getattr(lhs, 'ty', lhs), getattr(rhs, 'ty', rhs)
+    collections = Record, Tuple
+    if not (isinstance(left, collections) or isinstance(right, collections)):
+        return promote(lhs, rhs, promote_option)
+    if type(left) is not type(right):
+        raise TypeError('cannot promote %s and %s' % (lhs, rhs))
+    if isinstance(lhs, Option) or isinstance(rhs, Option):
+        result = promote(left, right, promote_option, structural=True)
+        return optionify(lhs, rhs, result) if promote_option else result
+    return _promote_structure(left, right, promote_option=promote_option)
+
+
 def optionify(lhs, rhs, dshape):
     """Check whether a binary operation's dshape came from
     :class:`~datashape.coretypes.Option` typed operands and construct an
@@ -91,8 +91,11 @@ def with_metaclass(metaclass, *bases):
         # Python 3
         class C(A, B, metaclass=M):
             pass
+
+    The intermediate class has empty ``__slots__``, so it does not stop
+    subclasses from declaring slots of their own.
     """
-    return metaclass('_', bases, {})
+    return metaclass('_', bases, {'__slots__': ()})
 
 
 try:
@@ -1,3 +1,4 @@
+import copy
 import datetime
 from operator import getitem
 import pickle
@@ -16,6 +17,7 @@ from datashape.coretypes import (
     Ellipsis,
     Fixed,
     Map,
+    NullRecord,
     Option,
     R,
     Record,
@@ -49,6 +51,7 @@ from datashape import (
     var,
 )
 from datashape.py2help import unicode, OrderedDict
+from datashape.typesets import integral
 
 
 @pytest.fixture
@@ -703,3 +706,170 @@ def test_launder_raises():
     # error with <class 'int'>
     assert "Received unsupported type" in returned_err
     assert "int" in returned_err
+
+
+def test_record_field_lookup():
+    record = Record([('a', int32), ('b', float64), ('c', string)])
+    assert record['b'] == float64
+    assert record.dict == {'a': int32, 'b': float64, 'c': string}
+    assert record._field_index('c') == 2
+    with pytest.raises(KeyError):
+        record['d']
+    with pytest.raises(TypeError):
+        record.dict['d'] = int32
+
+    names = record.names
+    names.append('d')
+    assert record.names == ['a', 'b', 'c']
+
+    ds = DataShape(var, record)
+    assert ds.subshape[:, ['c', 'a']] == dshape('var * {c: string, a: int32}')
+    with pytest.raises(ValueError):
+        ds.subshape[:, ['missing']]
+
+
+def test_record_field_lookup_after_unpickle():
+    record = Record([('a', int32), ('b', float64)])
+    record['a']
+    unpickled = pickle.loads(pickle.dumps(record))
+    assert unpickled['b'] == float64
+    assert unpickled.names == ['a', 'b']
+
+
+def test_subshapes():
+    ds = dshape('var * 10 * {name: string, amount: int32}')
+    indices = [0, (slice(None), 0, 'amount'), (slice(0, 5), slice(None),
+                                                ['amount', 'name']),
+               (0, 0, 'name')]
+    assert ds.subshapes(indices) == [ds.subshape[i] for i in indices]
+    assert ds.subshapes(indices) == [
+        dshape('10 * {name: string, amount: int32}'),
+        dshape('var * int32'),
+        dshape('5 * 10 * {amount: int32, name: string}'),
+        dshape('string'),
+    ]
+    assert ds.subshapes([]) == []
+
+
+def test_subshape_cache_keys_on_index_type():
+    ds = dshape('10 * {a: int32, b: float64}')
+    assert ds.subshape[1:2] == dshape('1 * {a: int32, b: float64}')
+    assert ds.subshape[1] == dshape('{a: int32, b: float64}')
+    assert ds.subshape[:, ['b']] == dshape('10 * {b: float64}')
+    assert ds.subshape[:, 'b'] == dshape('10 * float64')
+
+
+def test_subshape_cache_keys_on_scalar_type():
+    ds = dshape('10 * int32')
+    assert ds.subshape[1] == dshape('int32')
+    for index in [1.0, slice(1.0, 2)]:
+        with pytest.raises(TypeError):
+            ds.subshape[index]
+
+
+def test_subshape_unhashable_index():
+    ds = dshape('10 * int32')
+    with pytest.raises(TypeError) as exc:
+        ds.subshape[np.array([1, 2])]
+    assert 'invalid index value' in str(exc.value)
+
+
+def test_subarray_is_cached():
+    ds = dshape('2 * 3 * var * int32')
+    assert ds.subarray(1) is ds.subarray(1)
+    assert ds.subarray(1) == dshape('3 * var * int32')
+    assert ds.subarray(1).subarray(1) == ds.subarray(2)
+    assert ds.subarray(3) == DataShape(int32)
+    assert ds.subarray(3).measure == int32
+    with pytest.raises(IndexError):
+        ds.subarray(4)
+
+
+def test_rmul_checks_dimension():
+    ds = dshape('var * int32')
+    assert 3 * ds == dshape('3 * var * int32')
+    assert (var * ds).shape == (var, var)
+    with pytest.raises(TypeError):
+        int32 * ds
+
+
+slotted_types = [
+    int32,
+    String(10),
+    Fixed(3),
+    var,
+    TypeVar('T'),
+    null,
+    Option(int32),
+    Record([('a', int32), ('b', Option(float64))]),
+    Tuple([int32, float64]),
+    dshape('3 * var * {a: int32, b: ?string}'),
+    dshape('(int32, float64) -> int8'),
+]
+
+
+@pytest.mark.parametrize('ds', slotted_types)
+def test_compact_layout(ds):
+    assert not hasattr(ds, '__dict__')
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(ds, protocol))
+        assert unpickled == ds
+        assert unpickled.parameters == ds.parameters
+        assert hash(unpickled) == hash(ds)
+
+
+@pytest.mark.parametrize('ds', slotted_types)
+def test_text_is_memoized(ds):
+    text, representation = str(ds), repr(ds)
+    assert str(ds) is text
+    assert repr(ds) is representation
+    unpickled = pickle.loads(pickle.dumps(ds))
+    assert str(unpickled) == text
+    assert repr(unpickled) == representation
+
+
+def test_setstate_forgets_memoized_text():
+    ds = Fixed(3)
+    assert str(ds) == '3'
+    assert repr(ds) == 'Fixed(val=3)'
+    hash(ds)
+    ds.__setstate__((4,))
+    assert str(ds) == '4'
+    assert repr(ds) == 'Fixed(val=4)'
+    assert hash(ds) == hash(Fixed(4))
+
+
+@pytest.mark.parametrize('ds', [int32, string, var, null, date_, NullRecord,
+                                integral])
+def test_module_level_instances_pickle_by_name(ds):
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(ds, protocol)) is ds
+    assert copy.copy(ds) is ds
+    assert copy.deepcopy(ds) is ds
+
+
+def test_equal_instances_unpickle_as_module_level_instance():
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(String(), protocol)) is string
+        assert pickle.loads(pickle.dumps(Record([]), protocol)) is NullRecord
+        ds = pickle.loads(pickle.dumps(dshape('var * string'), protocol))
+        assert ds.measure is string
+        assert ds[0] is var
+
+
+def test_pickled_record_fields():
+    ds = dshape('3 * {a: int32, b: ?string, "c d": {e: var * int32}}')
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(ds, protocol))
+        assert unpickled == ds
+        assert unpickled.measure.names == ['a', 'b', 'c d']
+        assert unpickled.measure['c d'] == dshape('{e: var * int32}')
+
+
+@pytest.mark.parametrize('ds', slotted_types)
+def test_setstate_restores_older_pickles(ds):
+    # Pickles made before ``__reduce__`` rebuild instances this way
+    unpickled = object.__new__(type(ds))
+    unpickled.__setstate__(ds.__getstate__())
+    assert unpickled == ds
+    assert str(unpickled) == str(ds)
@@ -5,13 +5,15 @@ from warnings import catch_warnings, simplefilter
 import numpy as np
 import pytest
 
-from datashape.discovery import (discover, null, unite_identical, unite_base,
+from datashape.discovery import (discover, discover_stats, discovery_timings,
+                                 null,
+                                 unite_identical, unite_base,
                                  unite_merge_dimensions, do_one,
                                  lowest_common_dshape)
 from datashape.coretypes import (int64, float64, complex128, string, bool_,
                                  Tuple, Record, date_, datetime_, time_,
                                  timedelta_, int32, var, Option, real, Null,
-                                 TimeDelta, String, float32, R)
+                                 TimeDelta, String, float32, R, Categorical)
 from datashape.py2help import PY2, CPYTHON, mappingproxy, OrderedDict
 from datashape.util.testing import assert_dshape_equal
 from datashape import dshape
@@ -361,3 +363,148 @@ def test_discover_mock():
 
 def test_string_with_overflow():
     assert discover('INF US Equity') == string
+
+
+def test_discover_fixlen_strings():
+    data = [['Alice', 100], ['Bob', 200]]
+    assert discover(data) == 2 * Tuple([string, int64])
+    assert (discover(data, fixlen_threshold=10) ==
+            2 * Tuple([String(5, 'A'), int64]))
+    assert discover(data, fixlen_threshold=4) == 2 * Tuple([string, int64])
+
+
+def test_discover_fixlen_strings_unicode_and_missing():
+    data = [{'name': u'Zo\xeb', 'city': 'Paris'},
+            {'name': 'Bob', 'city': ''}]
+    assert (discover(data, fixlen_threshold=10) ==
+            2 * R['city': Option(String(5, 'A')), 'name': String(3, 'U32')])
+
+
+def test_discover_fixlen_strings_flat_and_nested():
+    assert discover(['a', 'bcd'], fixlen_threshold=8) == 2 * String(3, 'A')
+    assert (discover([['a', 'bc'], ['de', 'f']], fixlen_threshold=8) ==
+            dshape("2 * 2 * string[2, 'A']"))
+
+
+def test_discover_categorical():
+    data = [{'name': 'Alice', 'color': 'red'},
+            {'name': 'Bob', 'color': 'blue'},
+            {'name': 'Charlie', 'color': 'red'},
+            {'name': 'Dan', 'color': ''}]
+    assert discover(data) == 4 * R['color': Option(string), 'name': string]
+    assert (discover(data, categorical_threshold=0.75) ==
+            4 * R['color': Option(Categorical(['red', 'blue'], type=string)),
+                  'name': string])
+
+
+def test_discover_categorical_fixlen():
+    data = [['red', 1], ['blue', 2], ['red', 3], ['red', 4]]
+    result = discover(data, categorical_threshold=0.6, fixlen_threshold=8)
+    assert result == 4 * Tuple([Categorical(['red', 'blue'],
+                                            type=String(4, 'A')),
+                                int64])
+
+
+def test_discover_categorical_abandons_high_cardinality():
+    data = ['a', 'b', 'c', 'a']
+    assert discover(data, categorical_threshold=0.5) == 4 * string
+    assert (discover(['a', 'b'] * 10, categorical_threshold=0.5,
+                     max_categories=1) == 20 * string)
+    assert discover(['a', 'a', 'b'] * 3, categorical_threshold=0) == \
+        9 * string
+
+
+def test_discover_na_values():
+    data = [{'amount': '100', 'when': '2014-01-01'},
+            {'amount': 'NA', 'when': '\\N'},
+            {'amount': '-', 'when': 'NULL'}]
+    assert discover(data) == 3 * R['amount': string, 'when': string]
+    assert (discover(data, na_values=['NA', '-', 'NULL', '\\N']) ==
+            3 * R['amount': Option(int64), 'when': Option(date_)])
+
+
+def test_discover_na_values_in_nested_records():
+    data = [{'a': {'b': 'NA'}}, {'a': {'b': '1'}}]
+    assert discover(data) == 2 * R['a': R['b': string]]
+    assert (discover(data, na_values=['NA']) ==
+            2 * R['a': R['b': Option(int64)]])
+
+
+def test_discover_na_values_tuples():
+    data = [['1', 'N/A'], ['N/A', '2.5']]
+    assert (discover(data, na_values=['N/A']) ==
+            2 * Tuple([Option(int64), Option(float64)]))
+
+
+def test_discover_string_na_values():
+    assert discover('NA') == string
+    assert discover('NA', na_values=frozenset(['NA'])) == null
+
+
+def test_discover_stats_records():
+    data = [{'name': 'Alice', 'amount': '100', 'when': '2014-01-01'},
+            {'name': 'Bob', 'amount': '2.5', 'when': 'NA'},
+            {'name': 'Alice', 'amount': '7', 'when': '2014-01-03'}]
+    ds, stats = discover_stats(data, na_values=['NA'])
+    assert ds == discover(data, na_values=['NA'])
+    assert list(stats) == ['amount', 'name', 'when']
+    amount = stats['amount']
+    assert (amount.count, amount.nulls, amount.min, amount.max) == \
+        (3, 0, 2.5, 100)
+    assert amount.widened == 1
+    assert amount.distinct == 3
+    assert stats['name'].maxlen == 5
+    assert stats['name'].distinct == 2
+    assert stats['when'].nulls == 1
+    assert stats['when'].min == date(2014, 1, 1)
+    assert stats['when'].widened == 0
+
+
+def test_discover_stats_tuples_and_scalars():
+    ds, stats = discover_stats([[1, 'a'], [2, 'bcd'], [None, 'a']])
+    assert ds == 3 * Tuple([Option(int64), string])
+    assert [s.nulls for s in stats] == [1, 0]
+    assert stats[1].maxlen == 3
+
+    ds, stats = discover_stats([1, 2, 3])
+    assert ds == 3 * int64
+    assert (stats.min, stats.max, stats.distinct) == (1, 3, 3)
+
+
+def test_discover_stats_unorderable():
+    ds, stats = discover_stats([1, 'a', (1, 2)])
+    assert stats.min is None and stats.max is None
+    assert stats.count == 3
+
+
+def test_discover_stats_requires_sequence():
+    with pytest.raises(TypeError):
+        discover_stats(1)
+
+
+def test_discovery_timings():
+    data = [{'name': 'Alice', 'when': '2014-01-01'},
+            {'name': 'Bob', 'when': '2014-01-02 12:00:00'}]
+    with discovery_timings() as timings:
+        assert discover(data) == 2 * R['name': string, 'when': datetime_]
+    assert timings['discover(list)'].calls == 1
+    assert timings['discover(str)'].calls == 4
+    assert timings['coerce:dateparse'].calls == 2
+    assert timings['coerce:int'].calls == 4
+    assert timings['unite:unite_base'].calls >= 1
+    assert all(t.seconds >= 0 for t in timings.values())
+
+
+def test_discovery_timings_uninstalled_on_exit():
+    with discovery_timings() as timings:
+        discover('1')
+    n = timings['discover(str)'].calls
+    discover('1')
+    assert timings['discover(str)'].calls == n
+
+    with pytest.raises(ZeroDivisionError):
+        with discovery_timings():
+            1 / 0
+    with discovery_timings() as timings:
+        discover('1')
+    assert timings['discover(str)'].calls == 1
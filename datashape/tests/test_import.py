@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import datashape
+
+
+def imported_modules(code):
+    """ The modules imported by running ``code`` in a new interpreter """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(
+        datashape.__file__)))
+    output = subprocess.check_output([sys.executable, '-X', 'importtime',
+                                      '-c', code],
+                                     stderr=subprocess.STDOUT, cwd=root,
+                                     universal_newlines=True)
+    return set(line.rsplit('|', 1)[-1].strip()
+               for line in output.splitlines()
+               if line.startswith('import time:'))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='datashape is only loaded lazily on Python 3.7+')
+def test_parsing_does_not_load_discovery():
+    modules = imported_modules('import datashape\n'
+                               'datashape.dshape("var * {a: ?int32}")')
+    assert 'datashape.coretypes' in modules
+    for name in ['datashape.discovery', 'datashape._version', 'dateutil',
+                 'unittest.mock']:
+        assert name not in modules
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='datashape is only loaded lazily on Python 3.7+')
+def test_discovery_does_not_load_dateutil_until_needed():
+    modules = imported_modules('import datashape\n'
+                               'datashape.discover([1, 2.0, "a"])')
+    assert 'datashape.discovery' in modules
+    assert 'dateutil' not in modules
+
+    modules = imported_modules('import datashape\n'
+                               'datashape.discover("Jan 1 2000 10:00")')
+    assert 'dateutil' in modules
+
+
+def test_lazy_attributes():
+    assert datashape.discover([1, 2]) == datashape.dshape('2 * int64')
+    assert callable(datashape.discover_stats)
+    assert datashape.discovery.discover is datashape.discover
+    with pytest.raises(AttributeError):
+        datashape.not_an_attribute
+
+
+def test_star_import_exports_lazy_attributes():
+    namespace = {}
+    exec('from datashape import *', namespace)
+    for name in ['discover', 'discover_stats', 'discovery', 'dshape',
+                 'int32', 'promote']:
+        assert name in namespace
+    assert 'sys' not in namespace
+    assert namespace['discover'] is datashape.discover
@@ -1,7 +1,8 @@
 import pytest
 
 from datashape import dshape
-from datashape.predicates import isfixed, _dimensions, isnumeric, isscalar
+from datashape.predicates import (isfixed, _dimensions, isnumeric, isscalar,
+                                  isrecord, isreal, istabular, _parsed)
 from datashape.coretypes import TypeVar, int32, Categorical
 
 
@@ -24,3 +25,33 @@ def test_option():
 
 def test_time():
     assert not isnumeric('time')
+
+
+def test_results_are_cached_on_types():
+    ds = dshape('var * {name: string, amounts: 10 * ?float64}')
+    assert not hasattr(ds, '_predicates')
+    assert istabular(ds) is True
+    assert isfixed(ds) is False
+    assert isrecord(ds.measure) is True
+    flags = ds._predicates
+    assert istabular(ds) is True and isfixed(ds) is False
+    assert ds._predicates == flags
+
+    # each predicate has its own bits
+    assert not isnumeric(ds)
+    assert ds._predicates != flags
+    assert istabular(ds) is True and isfixed(ds) is False
+
+
+def test_unknown_results_are_cached():
+    ds = TypeVar('M') * int32
+    assert isfixed(ds) is None
+    assert isfixed(ds) is None
+
+
+def test_strings_are_parsed_once():
+    s = '10 * {a: int32, b: var * int32}'
+    assert isfixed(s) is False
+    assert s in _parsed
+    assert isfixed(s) is False
+    assert isnumeric('?float32') and isreal('?float32')
@@ -1,7 +1,10 @@
 import pytest
 
-from datashape import (promote, Option, float64, int64, float32, optionify,
-                       string, datetime_ as datetime, dshape)
+from datashape import (promote, promote_many, Option, float64, int64, float32,
+                       optionify, string, datetime_ as datetime, dshape, int8,
+                       int16, int32, uint8, uint32, complex128, bool_, String,
+                       Decimal, TimeDelta, DateTime, timedelta_, date_)
+from datashape.promote import _promote
 
 
 def test_simple():
@@ -128,3 +131,73 @@ def test_promote_datetime_with_option(x, y, p, r):
     assert (promote(x, y, promote_option=p) ==
             promote(y, x, promote_option=p) ==
             r)
+
+
+_promotable = [int8, int16, int32, int64, uint8, uint32, float32, float64,
+               complex128, bool_, string, String(10), Decimal(10, 2),
+               TimeDelta('s'), timedelta_, datetime, DateTime('UTC'), date_]
+
+
+@pytest.mark.parametrize('x', _promotable + list(map(Option, _promotable)))
+def test_memoized_promote_matches_uncached(x):
+    for y in _promotable + [Option(int64), dshape('?float32')]:
+        for p in (True, False):
+            try:
+                expected = _promote(x, y, p)
+            except Exception as e:
+                with pytest.raises(type(e)):
+                    promote(x, y, p)
+                continue
+            for _ in range(2):
+                result = promote(x, y, p)
+                assert result == expected
+                assert type(result) is type(expected)
+
+
+def test_promote_many():
+    assert promote_many([int8, int16, int32]) == int32
+    assert promote_many([int8, Option(int16), float32]) == Option(float32)
+    assert promote_many([int8, Option(int16)], promote_option=False) == int16
+    assert promote_many(iter([string])) == string
+    with pytest.raises(ValueError):
+        promote_many([])
+
+
+@pytest.mark.parametrize('x,y,r',
+                         [['3 * int32', '3 * int64', '3 * int64'],
+                          ['3 * int32', '4 * float32', 'var * float64'],
+                          ['3 * int32', 'var * int32', 'var * int32'],
+                          ['3 * var * int8', '2 * var * ?int8',
+                           'var * var * ?int8'],
+                          ['{a: int32, b: string}', '{a: ?float32, b: string}',
+                           '{a: ?float64, b: string}'],
+                          ['var * {a: 3 * int8}', 'var * {a: 4 * int16}',
+                           'var * {a: var * int16}'],
+                          ['(int32, string)', '(float64, ?string)',
+                           '(float64, ?string)'],
+                          ['?{a: int32}', '{a: int64}', '?{a: int64}'],
+                          ['int32', 'float32', 'float64']])
+def test_promote_structural(x, y, r):
+    x, y, r = dshape(x), dshape(y), dshape(r)
+    assert promote(x, y, structural=True) == r
+    assert promote(y, x, structural=True) == r
+    assert promote_many([x, y, x], structural=True) == r
+
+
+def test_promote_structural_without_options():
+    assert (promote(dshape('?{a: int32}'), dshape('{a: ?int64}'),
+                    promote_option=False, structural=True) ==
+            dshape('{a: int64}'))
+
+
+@pytest.mark.parametrize('x,y',
+                         [['3 * int32', '3 * 3 * int32'],
+                          ['{a: int32}', '{b: int32}'],
+                          ['{a: int32, b: int32}', '{b: int32, a: int32}'],
+                          ['(int32, int32)', '(int32,)'],
+                          ['{a: int32}', '(int32,)'],
+                          ['{a: int32}', 'int32'],
+                          ['T * int32', '3 * int32']])
+def test_promote_structural_mismatch(x, y):
+    with pytest.raises(TypeError):
+        promote(dshape(x), dshape(y), structural=True)
@@ -68,3 +68,33 @@ class TestDataShapeStr(unittest.TestCase):
 def test_arbitrary_string(s):
     ds = dshape(s)
     assert dshape(str(ds)) == ds
+
+
+def test_pprint_indents_nested_line_breaks():
+    ds = dshape('var * {id: int64, address: ?{street_address_line_one: '
+                'string, street_address_line_two: string, city: string}}')
+    assert datashape.pprint(ds, width=30) == '\n'.join([
+        'var * {',
+        '  id: int64,',
+        '  address: ?{',
+        '    street_address_line_one: string,',
+        '    street_address_line_two: string,',
+        '    city: string',
+        '    }',
+        '  }'])
+
+
+def test_pprint_empty_collections():
+    assert (datashape.pprint(dshape('{a: {}, b: ()}'), width=5) ==
+            '{\n  a: {},\n  b: ()\n  }')
+
+
+def test_pprint_deeply_nested():
+    ds = datashape.DataShape(datashape.int32)
+    for i in range(300):
+        ds = datashape.DataShape(datashape.Fixed(i + 1),
+                                 datashape.Record([('a', ds),
+                                                   ('b', datashape.string)]))
+    lines = datashape.pprint(ds).splitlines()
+    assert lines[:3] == ['300 * {', '  a: 299 * {', '    a: 298 * {']
+    assert lines[-3:] == ['    },', '  b: string', '  }']
@@ -1,3 +1,5 @@
+import pickle
+
 import datashape
 import pytest
 
@@ -15,6 +17,9 @@ def test_custom_typeset_repr():
     mytypeset = datashape.TypeSet(datashape.int64, datashape.float64)
     assert repr(mytypeset).startswith('TypeSet(')
     assert repr(mytypeset).endswith('name=None)')
+    single = datashape.TypeSet(datashape.int32)
+    assert repr(single) == 'TypeSet(%r, name=None)' % set([datashape.int32])
+    assert 'frozenset' not in repr(single)
 
 
 def test_register_already_existing_typeset_fails():
@@ -31,3 +36,55 @@ def test_getitem():
 def test_getitem_non_existent_typeset():
     with pytest.raises(KeyError):
         datashape.typesets.registry['footypeset']
+
+
+def test_membership():
+    floating = datashape.typesets.floating
+    assert datashape.float32 in floating
+    assert datashape.int32 not in floating
+    assert len(floating) == 2
+    assert len(datashape.TypeSet(datashape.int32, datashape.int32)) == 1
+    union = floating | datashape.typesets.boolean
+    assert datashape.bool_ in union and datashape.float64 in union
+    assert len(union) == 3
+
+
+def test_pickle():
+    floating = datashape.TypeSet(datashape.float32, datashape.float64)
+    unpickled = pickle.loads(pickle.dumps(floating))
+    assert unpickled == floating
+    assert datashape.float32 in unpickled
+    assert len(unpickled) == 2
+
+
+def test_signature_index():
+    from datashape.typesets import integral, floating, real, matches_typeset
+    signatures = [(integral, integral),
+                  (real, real),
+                  (datashape.int32, floating),
+                  (datashape.float64,),
+                  (real, datashape.bool_, real)]
+    index = datashape.SignatureIndex(signatures)
+    assert len(index) == 5
+
+    args = [(datashape.int8, datashape.int64),
+            (datashape.int32, datashape.float32),
+            (datashape.float32, datashape.float64),
+            (datashape.float64,),
+            (datashape.int32,),
+            (datashape.float32, datashape.bool_, datashape.uint8),
+            (datashape.string, datashape.int32),
+            ()]
+    for types in args:
+        expected = tuple(s for s in signatures
+                         if len(s) == len(types) and
+                         matches_typeset(types, s))
+        assert index.resolve(types) == expected
+        assert index.resolve(list(types)) == expected
+
+    assert index.resolve((datashape.int32, datashape.float32)) == (
+        (real, real), (datashape.int32, floating))
+
+    index.add((datashape.string, datashape.int32))
+    assert index.resolve((datashape.string, datashape.int32)) == (
+        (datashape.string, datashape.int32),)
@@ -1,5 +1,6 @@
 import pytest
 
+import datashape
 from datashape.user import *
 from datashape import dshape
 from datetime import date, time, datetime
@@ -71,9 +72,345 @@ def test_issubschema():
     assert issubschema('2 * int', '2 * int')
     assert not issubschema('2 * int', '3 * int')
 
-    # assert issubschema('float32', 'real')
+    assert issubschema('float32', 'real')
 
 
 def test_integration():
     assert validate('{name: string, arrived: date}',
                     {'name': 'Alice', 'arrived': date(2012, 1, 5)})
+
+
+def test_compile_validator_scalars():
+    assert compile_validator('int32')(1)
+    assert not compile_validator('int32')(1.0)
+    assert not compile_validator('int32')(True)
+    assert compile_validator('int32')(np.int8(1))
+    assert compile_validator('uint32')(5)
+    assert compile_validator('uint32')(0)
+    assert compile_validator('uint32')(np.uint8(5))
+    assert not compile_validator('uint32')(-1)
+    assert not compile_validator('uint32')(True)
+    assert not compile_validator('uint32')(5.0)
+    assert compile_validator('int8')(127)
+    assert compile_validator('int8')(-128)
+    assert not compile_validator('int8')(128)
+    assert not compile_validator('int8')(-129)
+    assert not compile_validator('int8')(10 ** 30)
+    assert not compile_validator('int8')(np.int64(500))
+    assert compile_validator('uint8')(255)
+    assert not compile_validator('uint8')(256)
+    assert not compile_validator('uint8')(300)
+    assert compile_validator('uint64')(2 ** 64 - 1)
+    assert compile_validator('real')(2.0)
+    assert not compile_validator('real')(2)
+    assert compile_validator('bool')(True)
+    assert compile_validator('string')('Alice')
+    assert not compile_validator('string[3]')('Alice')
+    assert compile_validator('?int64')(None)
+    assert not compile_validator('int64')(None)
+    assert compile_validator('date')(date(2000, 1, 1))
+    assert compile_validator('datetime')(datetime(2000, 1, 1, 12))
+    assert not compile_validator('datetime')(date(2000, 1, 1))
+    assert compile_validator('time')(time(12, 0, 0))
+
+
+def test_compile_validator_dimensions():
+    assert compile_validator('2 * int')((1, 2))
+    assert not compile_validator('3 * int')((1, 2))
+    assert not compile_validator('2 * int')(2)
+    assert compile_validator('2 * 3 * int')([(1, 2, 3), (4, 5, 6)])
+    assert compile_validator('var * int')([])
+    assert compile_validator('... * int')([[1, 2], [3]])
+    assert compile_validator('... * int')(1)
+
+
+def test_compile_validator_records():
+    is_valid = compile_validator('var * {x: int, y: ?real}')
+    assert is_valid([{'x': 1, 'y': 2.0}, {'x': 3, 'y': None}])
+    assert is_valid([{'x': 1}])
+    assert not is_valid([{'x': 1, 'y': 2}])
+    assert is_valid([(1, 2.0), [3, None]])
+    assert not is_valid([(1, 2.0, 3)])
+    assert compile_validator('(int, string)')((1, 'a'))
+    assert not compile_validator('(int, string)')(('a', 1))
+
+
+@pytest.mark.parametrize('schema,value', [
+    ('{name: string, arrived: date}',
+     {'name': 'Alice', 'arrived': date(2012, 1, 5)}),
+    ('var * {x: string, y: real}', [{'x': 'a', 'y': 1.0}]),
+    ('var * {x: string, y: real}', [{'x': 'a', 'y': 'b'}]),
+    ('2 * real', (1.0, 2.0)),
+    ('3 * real', (1.0, 2.0)),
+    ('datetime', datetime(1999, 1, 20, 12, 0, 0)),
+])
+def test_compile_validator_agrees_with_validate(schema, value):
+    assert compile_validator(schema)(value) == bool(validate(schema, value))
+
+
+def test_validate_array_dtypes():
+    x = np.array([1, 2, 300], dtype='int64')
+    assert not validate_array('var * int64', x).any()
+    assert not validate_array('3 * int32', x).any()
+    assert validate_array('var * int8', x).tolist() == [False, False, True]
+    assert validate_array('var * uint8', np.array([-1, 1])).tolist() == \
+        [True, False]
+    assert validate_array('var * int32', np.ones(2, dtype='f8')).all()
+    assert not validate_array('var * float64', np.ones(2, dtype='i4')).any()
+    assert not validate_array('var * ?float64', np.array([1.0, np.nan])).any()
+    assert validate_array('var * string[3]',
+                          np.array(['a', 'abcd'])).tolist() == [False, True]
+
+
+def test_validate_array_datetime_units():
+    x = np.array(['2000-01-01', 'NaT'], dtype='M8[ns]')
+    assert not validate_array('var * datetime', x).any()
+    assert not validate_array('var * ?datetime', x).any()
+    assert not validate_array('var * timedelta',
+                              np.array([1, 2], dtype='m8[s]')).any()
+    assert validate_array('var * datetime',
+                          np.array([1, 2], dtype='m8[s]')).all()
+
+
+def test_validate_array_integers_as_floats():
+    assert not validate_array('var * float32',
+                              np.array([1, 2], dtype='i4')).any()
+    assert validate_array('var * float32',
+                          np.array([1, 2 ** 24 + 1], dtype='i8')).tolist() == \
+        [False, True]
+    assert validate_array('var * float64',
+                          np.array([2 ** 63 - 1, -2 ** 63],
+                                   dtype='i8')).tolist() == [True, False]
+    assert validate_array('var * float16',
+                          np.array([10 ** 6, 1])).tolist() == [True, False]
+
+
+def test_validate_array_booleans_are_not_numbers():
+    assert validate_array('var * int32', np.array([True, False])).all()
+    assert validate_array('var * float64', np.array([True, False])).all()
+    assert validate_array('var * bool', np.array([0, 1])).all()
+    assert not validate_array('var * bool', np.array([True, False])).any()
+    objects = np.array([True, False], dtype='O')
+    assert (validate_array('var * int32', objects).tolist() ==
+            validate_array('var * int32', np.array([True, False])).tolist())
+
+
+def test_validate_array_shapes():
+    x = np.zeros((3, 2), dtype='int32')
+    assert not validate_array('3 * 2 * int32', x).any()
+    assert not validate_array('var * 2 * int32', x).any()
+    assert not validate_array('N * 2 * int32', x).any()
+    assert not validate_array('... * int32', x).any()
+    assert validate_array('3 * 3 * int32', x).all()
+    assert validate_array('3 * int32', x).all()
+    assert validate_array('var * int32', x).shape == (3,)
+    with pytest.raises(ValueError):
+        validate_array('int32', np.array(1))
+
+
+def test_validate_array_structured():
+    x = np.array([('Alice', 100, (1.0, 2.0)), ('Bob', -1, (3.0, 4.0))],
+                 dtype=[('name', 'U5'), ('amount', 'i4'), ('xy', 'f8', 2)])
+    schema = 'var * {name: string, amount: int64, xy: 2 * float64}'
+    assert not validate_array(schema, x).any()
+    assert validate_array('var * {name: string[3], amount: uint32, '
+                          'xy: 2 * float64}', x).tolist() == [True, True]
+    assert validate_array('var * {name: string[3], amount: int64, '
+                          'xy: 2 * float64}', x).tolist() == [True, False]
+    assert validate_array('var * {name: string, amount: int64, '
+                          'xy: 3 * float64}', x).all()
+    assert validate_array('var * {name: string, amount: int64}', x).all()
+    assert not validate_array('var * (string, int32, 2 * float64)', x).any()
+
+
+def test_validate_array_objects():
+    x = np.array([{'a': 1}, {'a': None}, {'a': 'x'}], dtype='O')
+    assert validate_array('var * {a: ?int64}', x).tolist() == \
+        [False, False, True]
+
+    rows = np.empty(2, dtype='O')
+    rows[0], rows[1] = [1, 2], [1, 2, 3]
+    assert validate_array('var * 2 * int64', rows).tolist() == [False, True]
+    assert not validate_array('var * var * int64', rows).any()
+
+    x = np.array([('a', 1), ('b', None)],
+                 dtype=[('name', 'O'), ('amount', 'O')])
+    assert validate_array('var * {name: string, amount: int64}',
+                          x).tolist() == [False, True]
+
+
+def test_validate_array_strings_from_numbers():
+    assert validate_array('var * string', np.array([1, 2])).all()
+    assert validate_array('var * ?string', np.array([1.5, 2.5])).all()
+    assert validate_array("var * categorical[['a', 'b']]",
+                          np.array([1, 2])).all()
+    assert validate_array('var * object', np.array([1, 2])).all()
+    assert validate_array('var * categorical[[1, 2]]',
+                          np.array([1, 3])).tolist() == [False, True]
+
+
+def test_validate_array_empty():
+    assert validate_array('var * 2 * int64', np.zeros((0, 2))).shape == (0,)
+    assert validate_array('var * 2 * string',
+                          np.zeros((0, 2), dtype='U1')).shape == (0,)
+
+
+def test_iter_errors():
+    rows = [{'name': 'Alice', 'amounts': [1, 2]},
+            {'name': 1, 'amounts': [1, 'x', 3.0]},
+            ('Bob', [1, 2]),
+            ('Bob',)]
+    errors = list(iter_errors('var * {name: string, amounts: var * int64}',
+                              iter(rows)))
+    assert [(e.row, e.path) for e in errors] == [(1, ('name',)),
+                                                  (1, ('amounts', 1)),
+                                                  (1, ('amounts', 2)),
+                                                  (3, ())]
+    assert errors[1].expected == dshape('int64')
+    assert errors[1].value == 'x'
+    assert str(errors[2]) == \
+        'row 1, path: _.amounts[2]: expected int64, got 3.0'
+
+
+def test_iter_errors_stops_at_budget():
+    def rows():
+        i = 0
+        while True:
+            yield (i, 'x')
+            i += 1
+
+    errors = list(iter_errors('(int64, int64)', rows(), max_errors=3))
+    assert [(e.row, e.path) for e in errors] == [(0, (1,)), (1, (1,)),
+                                                  (2, (1,))]
+
+
+def test_iter_errors_compiles_each_schema_once(monkeypatch):
+    compiled = []
+
+    def compile_validator(schema):
+        compiled.append(schema)
+        return datashape.user._compile_validator(schema)
+
+    monkeypatch.setattr(datashape.user, 'compile_validator',
+                        compile_validator)
+    rows = [{'name': 1, 'amounts': [1, 'x']}] * 10
+    errors = list(iter_errors('{name: string, amounts: var * int64}', rows))
+    assert len(errors) == 20
+    assert len(compiled) == len(set(compiled)) == 4
+
+
+def test_find_errors():
+    rows = [{'x': i if i % 2 else None} for i in range(100)]
+    assert find_errors('{x: ?int64}', rows) == []
+    errors = find_errors('{x: int64}', rows, max_errors=2)
+    assert [e.row for e in errors] == [0, 2]
+    assert errors[0].expected == dshape('int64')
+
+
+@pytest.mark.parametrize('threads', [True, False])
+def test_validate_parallel_sequence(threads):
+    rows = [{'x': i, 'y': 'a'} for i in range(100)]
+    rows[7]['y'] = None
+    rows[42]['x'] = 'x'
+    mask = validate_parallel('var * {x: int64, y: string}', rows,
+                             chunksize=10, max_workers=2, threads=threads)
+    assert mask.shape == (100,)
+    assert np.flatnonzero(mask).tolist() == [7, 42]
+
+
+@pytest.mark.parametrize('threads', [True, False])
+def test_validate_parallel_array(threads):
+    x = np.arange(25, dtype='int64')
+    x[[3, 20]] = 1000
+    mask = validate_parallel('25 * int8', x, chunksize=4, max_workers=2,
+                             threads=threads)
+    assert np.flatnonzero(mask).tolist() == [3, 20]
+
+
+def test_validate_parallel_without_pool_initializer(monkeypatch):
+    import concurrent.futures
+
+    class ThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
+        # The signature before Python 3.7
+        def __init__(self, max_workers=None):
+            super(ThreadPoolExecutor, self).__init__(max_workers)
+
+    monkeypatch.setattr(concurrent.futures, 'ThreadPoolExecutor',
+                        ThreadPoolExecutor)
+    mask = validate_parallel('var * int64', [1, 'a', 3, 4, 'b'],
+                             chunksize=2, max_workers=2, threads=True)
+    assert np.flatnonzero(mask).tolist() == [1, 4]
+    assert not datashape.user._chunk_validators
+
+
+def test_validate_parallel_iterator_and_length():
+    rows = iter([(1, 2)] * 5)
+    assert not validate_parallel('var * 2 * int64', rows, chunksize=2,
+                                 threads=True).any()
+    assert validate_parallel('3 * int64', [1, 2], threads=True).all()
+    assert validate_parallel('var * int64', [], threads=True).shape == (0,)
+    with pytest.raises(TypeError):
+        validate_parallel('int64', [1, 2])
+
+
+@pytest.mark.parametrize('a,b', [
+    ('int8', 'int64'),
+    ('uint8', 'int16'),
+    ('int32', 'float64'),
+    ('bool', 'int8'),
+    ('int32', '?int64'),
+    ('?int32', '?int64'),
+    ('null', '?string'),
+    ("string[10, 'A']", 'string'),
+    ('string[10]', 'string[20]'),
+    ('3 * int32', 'var * int32'),
+    ('3 * 4 * int32', 'N * M * int32'),
+    ('3 * 4 * int32', '... * int32'),
+    ('3 * 4 * int32', '3 * ... * int64'),
+    ('int32', 'T'),
+    ('var * {x: int32}', 'var * T'),
+    ('{x: int32, y: float32, z: string}', '{y: float64, x: int32}'),
+    ('{x: {a: int8, b: int8}}', '{x: {a: ?int16}}'),
+    ('{x: 3 * int32}', '{x: var * int64}'),
+    ('(int32, string)', '(int64, ?string)'),
+    ("datetime[tz='UTC']", 'datetime'),
+    ('decimal[9, 2]', 'decimal[18, 4]'),
+])
+def test_issubschema_true(a, b):
+    assert issubschema(a, b) is True
+
+
+@pytest.mark.parametrize('a,b', [
+    ('int64', 'int32'),
+    ('int64', 'uint64'),
+    ('float64', 'int64'),
+    ('?int32', 'int64'),
+    ('null', 'int64'),
+    ('string', 'string[10]'),
+    ('string[20]', 'string[10]'),
+    ("string[10, 'U32']", "string[10, 'A']"),
+    ('var * int32', '3 * int32'),
+    ('3 * int32', '3 * 3 * int32'),
+    ('... * int32', '3 * int32'),
+    ('{x: int32}', '{x: int32, y: int32}'),
+    ('{x: int64, y: int32}', '{x: int32}'),
+    ('(int32, string)', '(int32,)'),
+    ('date', 'datetime'),
+    ('datetime', "datetime[tz='UTC']"),
+    ('decimal[18, 4]', 'decimal[9, 2]'),
+    ('string', 'int32'),
+])
+def test_issubschema_false(a, b):
+    assert issubschema(a, b) is False
+
+
+def test_issubschema_memoized():
+    a = dshape('var * {x: int32, y: float32}')
+    b = dshape('var * {x: int64}')
+    assert issubschema(a, b)
+    assert datashape.user._subschema_cache[a, b] is True
+
+
+def test_validate_numpy_widening():
+    assert validate('2 * int64', np.array([1, 2], dtype='int32'))
+    assert not validate('2 * int8', np.array([1, 2], dtype='int32'))
@@ -70,3 +70,25 @@ def test_has_ellipsis(ds):
                           (dshape("M * int32"),)])
 def test_not_has_ellipsis(ds):
     assert not has_ellipsis(ds)
+
+
+@pytest.mark.parametrize('ds', ['{a: ... * ... * int32}',
+                                '(int32, ... * ... * int32)',
+                                '?{a: {b: ... * ... * int32}}'])
+def test_nested_wildcards_are_invalid(ds):
+    with pytest.raises(TypeError):
+        dshape(ds)
+
+
+def test_dshape_validates_once():
+    rec = datashape.Record([('f%d' % i, datashape.var * datashape.int32)
+                            for i in range(10)])
+    assert not getattr(rec, '_validated', False)
+    ds = dshape(rec)
+    assert rec._validated and ds._validated
+    assert all(t._validated for t in rec.types)
+
+    # already validated components are not traversed again
+    rec.types[0]._parameters = (datashape.Ellipsis(), datashape.Ellipsis(),
+                                datashape.int32)
+    assert dshape(rec).measure is rec
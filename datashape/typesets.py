@@ -6,12 +6,13 @@ from itertools import chain
 
 from .coretypes import (Unit, int8, int16, int32, int64, uint8, uint16, uint32,
                         uint64, float16, float32, float64, complex64,
-                        complex128, bool_, Decimal, TimeDelta, Option)
+                        complex128, bool_, Decimal, TimeDelta, Option,
+                        _pickle_by_name)
 
 
 __all__ = ['TypeSet', 'matches_typeset', 'signed', 'unsigned', 'integral',
            'floating', 'complexes', 'boolean', 'numeric', 'scalar',
-           'maxtype']
+           'maxtype', 'SignatureIndex']
 
 
 class TypeSet(Unit):
@@ -19,18 +20,16 @@ class TypeSet(Unit):
     Create a new set of types. Keyword argument 'name' may create a registered
     typeset for use in datashape type strings.
     """
-    __slots__ = '_order', 'name'
+    __slots__ = '_order', 'name', '_set'
+    _parameter_slots = '_order', 'name'
 
     def __init__(self, *args, **kwds):
         self._order = args
+        self._set = frozenset(args)
         self.name = kwds.get('name')
         if self.name:
             register_typeset(self.name, self)
 
-    @property
-    def _set(self):
-        return set(self._order)
-
     @property
     def types(self):
         return self._order
@@ -40,7 +39,15 @@ class TypeSet(Unit):
                 self.name == other.name and self.types == other.types)
 
     def __hash__(self):
-        return hash((self.name, self.types))
+        try:
+            h = self._hash
+        except AttributeError:
+            h = self._hash = hash((self.name, self.types))
+        return h
+
+    def _set_parameters(self, parameters):
+        super(TypeSet, self)._set_parameters(parameters)
+        self._set = frozenset(self._order)
 
     def __contains__(self, val):
         return val in self._set
@@ -48,8 +55,8 @@ class TypeSet(Unit):
     def __repr__(self):
         if self.name:
             return '{%s}' % (self.name,)
-        return "%s(%s, name=%s)" % (self.__class__.__name__, self._set,
-                                    self.name)
+        return "%s(%s, name=%s)" % (self.__class__.__name__,
+                                    set(self._order), self.name)
 
     def __or__(self, other):
         return TypeSet(*chain(self, other))
@@ -82,6 +89,72 @@ def matches_typeset(types, signature):
     return match
 
 
+class SignatureIndex(object):
+    """An index of signatures for finding those that match argument types
+
+    A signature is a sequence of types and type sets.  It matches a sequence
+    of argument types of the same length when ``matches_typeset`` does.  The
+    index maps each type, at each argument position, to the set of signatures
+    accepting it there, so resolving arguments takes one lookup per argument
+    however many signatures there are.  Resolutions are cached.
+
+    >>> index = SignatureIndex([(integral, integral), (real, floating),
+    ...                         (int32, bool_)])
+    >>> index.resolve((int64, int8))
+    (({integral}, {integral}),)
+    >>> index.resolve((int32, float64))
+    (({real}, {floating}),)
+    >>> index.resolve((int32, bool_))
+    ((ctype("int32"), ctype("bool")),)
+    >>> index.resolve((float64, int32))
+    ()
+    """
+
+    def __init__(self, signatures=()):
+        self.signatures = []
+        # arity -> ([{type: bitset of signatures}, ...], all signatures)
+        self._positions = {}
+        self._cache = {}
+        for signature in signatures:
+            self.add(signature)
+
+    def add(self, signature):
+        """Add ``signature`` to the index"""
+        signature = tuple(signature)
+        bit = 1 << len(self.signatures)
+        self.signatures.append(signature)
+        positions, bits = self._positions.get(len(signature),
+                                              ([{} for _ in signature], 0))
+        for position, types in zip(positions, signature):
+            for t in types if isinstance(types, TypeSet) else (types,):
+                position[t] = position.get(t, 0) | bit
+        self._positions[len(signature)] = positions, bits | bit
+        self._cache.clear()
+
+    def resolve(self, types):
+        """The signatures matching ``types``, in the order they were added"""
+        types = tuple(types)
+        try:
+            return self._cache[types]
+        except KeyError:
+            pass
+        positions, bits = self._positions.get(len(types), ((), 0))
+        for position, t in zip(positions, types):
+            if not bits:
+                break
+            bits &= position.get(t, 0)
+        matches = []
+        while bits:
+            low = bits & -bits
+            matches.append(self.signatures[low.bit_length() - 1])
+            bits ^= low
+        result = self._cache[types] = tuple(matches)
+        return result
+
+    def __len__(self):
+        return len(self.signatures)
+
+
 class TypesetRegistry(object):
     def __init__(self):
         self.registry = {}
@@ -120,6 +193,10 @@ real = TypeSet(*integral | floating, name='real')
 numeric = TypeSet(*integral | floating | complexes, name='numeric')
 scalar = TypeSet(*boolean | numeric, name='scalar')
 
+_pickle_by_name(globals(), ['signed', 'unsigned', 'integral', 'floating',
+                            'complexes', 'boolean', 'real', 'numeric',
+                            'scalar'])
+
 
 supertype_map = {
     int8: signed,
@@ -3,11 +3,16 @@ from datashape.dispatch import dispatch
 from .coretypes import *
 from .predicates import isdimension
 from .util import dshape
+from .py2help import _inttypes, _strtypes
+from collections import namedtuple
+from functools import partial
+from itertools import count, islice, repeat
 import sys
-from datetime import date, time, datetime
+from datetime import date, time, datetime, timedelta
 
 
-__all__ = ['validate', 'issubschema']
+__all__ = ['validate', 'issubschema', 'compile_validator', 'validate_array',
+           'iter_errors', 'find_errors', 'RowError', 'validate_parallel']
 
 
 basetypes = np.generic, int, float, str, date, time, datetime
@@ -87,11 +92,621 @@ def issubschema(a, b):
     return issubschema(dshape(a), dshape(b))
 
 
+# Memoized results of issubschema on pairs of datashapes
+_subschema_cache = {}
+_subschema_cache_size = 100000
+
+
 @dispatch(DataShape, DataShape)
 def issubschema(a, b):
-    if a == b:
+    """ Is every value of datashape ``a`` also a valid value of ``b``?
+
+    Numbers widen when NumPy can cast them safely, ``T`` is a subschema of
+    ``?T``, fixed dimensions are subschemas of ``var`` and type variables
+    match anything.  Records with extra fields, or with fields that are
+    themselves subschemas, are subschemas.  Results are memoized.
+
+    >>> issubschema('int32', 'int64')
+    True
+    >>> issubschema('int64', 'int32')
+    False
+    >>> issubschema('3 * {x: int32, y: float32, z: string}',
+    ...             'var * {x: ?int64, y: float64}')
+    True
+    """
+    key = a, b
+    try:
+        return _subschema_cache[key]
+    except KeyError:
+        pass
+    result = a == b or (_dims_issubschema(a.shape, b.shape) and
+                        _measure_issubschema(a.measure, b.measure))
+    if len(_subschema_cache) >= _subschema_cache_size:
+        _subschema_cache.clear()
+    _subschema_cache[key] = result
+    return result
+
+
+def _dims_issubschema(a, b):
+    for i, dim in enumerate(b):
+        if isinstance(dim, Ellipsis):
+            rest = b[i + 1:]
+            return (len(a) >= i + len(rest) and
+                    _dims_issubschema(a[len(a) - len(rest):], rest))
+        if i >= len(a) or isinstance(a[i], Ellipsis):
+            return False
+        if not (a[i] == dim or isinstance(dim, (Var, TypeVar))):
+            return False
+    return len(a) == len(b)
+
+
+def _measure_issubschema(a, b):
+    if a == b or isinstance(b, TypeVar):
         return True
-    # TODO, handle cases like float < real
-    # TODO, handle records {x: int, y: int, z: int} < {x: int, y: int}
+    if isinstance(a, DataShape) or isinstance(b, DataShape):
+        return issubschema(dshape(a), dshape(b))
+    if isinstance(b, Option):
+        return (isinstance(a, Null) or
+                _measure_issubschema(getattr(a, 'ty', a), b.ty))
+    if isinstance(a, Option):
+        return False
+    if isinstance(a, Categorical):
+        if isinstance(b, Categorical):
+            return (not b.ordered and
+                    set(a.categories) <= set(b.categories) and
+                    _measure_issubschema(a.type, b.type))
+        return _measure_issubschema(a.type, b)
+    if isinstance(a, CType) and isinstance(b, CType):
+        try:
+            adtype, bdtype = to_numpy_dtype(a), to_numpy_dtype(b)
+        except TypeError:
+            return False
+        return (adtype.kind in 'biufc' and bdtype.kind in 'biufc' and
+                np.can_cast(adtype, bdtype, casting='safe'))
+    if isinstance(a, String) and isinstance(b, String):
+        return ((a.encoding == b.encoding or a.encoding == 'A') and
+                (b.fixlen is None or
+                 a.fixlen is not None and a.fixlen <= b.fixlen))
+    if isinstance(a, Record) and isinstance(b, Record):
+        fields = a.dict
+        return all(name in fields and _measure_issubschema(fields[name], typ)
+                   for name, typ in b.fields)
+    if isinstance(a, Tuple) and isinstance(b, Tuple):
+        return (len(a.dshapes) == len(b.dshapes) and
+                all(map(issubschema, a.dshapes, b.dshapes)))
+    if type(a) is type(b) and isinstance(a, (Time, DateTime)):
+        return b.tz is None or a.tz == b.tz
+    if isinstance(a, Decimal) and isinstance(b, Decimal):
+        return (a.scale <= b.scale and
+                a.precision - a.scale <= b.precision - b.scale)
+    return False
+
+
+def compile_validator(schema):
+    """ Compile a schema into a function that validates values against it
+
+    The schema is walked once, up front, producing a function that checks
+    values with plain ``isinstance`` and length tests rather than dispatching
+    on every value like ``validate``.  Use it to validate many values against
+    the same schema.
+
+    >>> is_valid = compile_validator('var * {name: string, amount: ?int32}')
+    >>> is_valid([{'name': 'Alice', 'amount': 100},
+    ...           {'name': 'Bob', 'amount': None}])
+    True
+    >>> is_valid([('Alice', 100), ('Bob', 1.5)])
+    False
+    """
+    return _compile_validator(dshape(schema))
+
+
+@dispatch(DataShape)
+def _compile_validator(schema):
+    check = _compile_validator(schema.measure)
+    for dim in reversed(schema.shape):
+        check = _compile_dimension(dim, check)
+    return check
+
+
+def _compile_dimension(dim, check):
+    if isinstance(dim, Fixed):
+        n = int(dim)
+
+        def check_fixed(value):
+            return (isinstance(value, (tuple, list)) and len(value) == n and
+                    all(map(check, value)))
+        return check_fixed
+    if isinstance(dim, (Var, TypeVar)):
+        def check_var(value):
+            return isinstance(value, (tuple, list)) and all(map(check, value))
+        return check_var
+    if isinstance(dim, Ellipsis):
+        def check_ellipsis(value):
+            return check(value) or (isinstance(value, (tuple, list)) and
+                                    all(map(check_ellipsis, value)))
+        return check_ellipsis
+    raise TypeError('Cannot validate against dimension %s' % dim)
+
+
+# Python and NumPy scalar types accepted for each kind of NumPy dtype
+_kind_types = {
+    'i': _inttypes + (np.signedinteger,),
+    'u': _inttypes + (np.unsignedinteger,),
+    'f': (float, np.floating),
+    'c': (complex, np.complexfloating),
+    'b': (bool, np.bool_),
+}
+
+
+@dispatch(CType)
+def _compile_validator(schema):
+    try:
+        dtype = to_numpy_dtype(schema)
+        types = _kind_types[dtype.kind]
+    except (TypeError, KeyError):
+        return _validate_with(schema)
+    if dtype.kind in 'iu':
+        # within the bounds of the dtype, as in ``validate_array``
+        info = np.iinfo(dtype)
+        low, high = int(info.min), int(info.max)
+
+        def check_int(value):
+            return (isinstance(value, types) and
+                    not isinstance(value, bool) and low <= value <= high)
+        return check_int
+    return lambda value: isinstance(value, types)
+
+
+@dispatch(String)
+def _compile_validator(schema):
+    if schema.fixlen is None:
+        return lambda value: isinstance(value, _strtypes)
+    n = schema.fixlen
+    return lambda value: isinstance(value, _strtypes) and len(value) <= n
+
+
+@dispatch(Option)
+def _compile_validator(schema):
+    check = _compile_validator(schema.ty)
+    return lambda value: value is None or check(value)
+
+
+@dispatch(Null)
+def _compile_validator(schema):
+    return lambda value: value is None
 
-    return None  # We don't know, return something falsey
+
+@dispatch(Record)
+def _compile_validator(schema):
+    checks = tuple((name, _compile_validator(typ))
+                   for name, typ in schema.fields)
+    n = len(checks)
+
+    def check_record(value):
+        if isinstance(value, dict):
+            get = value.get
+            for name, check in checks:
+                if not check(get(name)):
+                    return False
+            return True
+        if isinstance(value, (tuple, list)) and len(value) == n:
+            for (_, check), item in zip(checks, value):
+                if not check(item):
+                    return False
+            return True
+        return False
+    return check_record
+
+
+@dispatch(Tuple)
+def _compile_validator(schema):
+    checks = tuple(map(_compile_validator, schema.dshapes))
+    n = len(checks)
+
+    def check_tuple(value):
+        if isinstance(value, (tuple, list)) and len(value) == n:
+            for check, item in zip(checks, value):
+                if not check(item):
+                    return False
+            return True
+        return False
+    return check_tuple
+
+
+@dispatch(Categorical)
+def _compile_validator(schema):
+    categories = frozenset(schema.categories)
+
+    def check_categorical(value):
+        try:
+            return value in categories
+        except TypeError:  # unhashable
+            return False
+    return check_categorical
+
+
+@dispatch(Date)
+def _compile_validator(schema):
+    return lambda value: isinstance(value, date)
+
+
+@dispatch(DateTime)
+def _compile_validator(schema):
+    return lambda value: isinstance(value, datetime)
+
+
+@dispatch(Time)
+def _compile_validator(schema):
+    return lambda value: isinstance(value, time)
+
+
+@dispatch(TimeDelta)
+def _compile_validator(schema):
+    return lambda value: isinstance(value, (timedelta, np.timedelta64))
+
+
+@dispatch(TypeVar)
+def _compile_validator(schema):
+    return lambda value: True
+
+
+@dispatch(Mono)
+def _compile_validator(schema):
+    return _validate_with(schema)
+
+
+def _validate_with(schema):
+    """ Fall back to ``validate`` for schemas without a compiled check """
+    return lambda value: bool(validate(schema, value))
+
+
+def validate_array(schema, x):
+    """ Find the rows of an array that do not conform to a schema
+
+    ``schema`` describes the whole array, including its leading dimension.
+    Structured arrays are checked field by field, object arrays element by
+    element and other arrays by whether their dtype can be cast to the
+    schema's measure without loss, using vectorized NumPy operations where
+    possible.
+
+    Returns a boolean mask over the first axis of ``x`` that is ``True`` for
+    invalid rows.  Every row is invalid if the array's shape does not match
+    the dimensions of the schema.
+
+    >>> x = np.array([1, 2, 3], dtype='int64')
+    >>> validate_array('var * int32', x)
+    array([False, False, False])
+    >>> validate_array('var * int8', np.array([1, 300], dtype='int64'))
+    array([False,  True])
+    >>> validate_array('var * ?string', np.array(['a', None, 1], dtype='O'))
+    array([False, False,  True])
+    >>> validate_array('2 * int32', x)
+    array([ True,  True,  True])
+    """
+    schema = dshape(schema)
+    x = np.asarray(x)
+    if not x.shape:
+        raise ValueError('Cannot validate rows of a zero dimensional array')
+    dims, measure = schema.shape, schema.measure
+    if x.dtype == object and not any(isinstance(d, Ellipsis) for d in dims):
+        # Trailing dimensions may be held by the objects themselves
+        dims, inner = dims[:x.ndim], dims[x.ndim:]
+        if inner:
+            measure = DataShape(*inner + (measure,))
+    if not _dims_match(dims, x.shape):
+        return np.ones(len(x), dtype=bool)
+    return _any_trailing(_invalid_elements(measure, x), 1)
+
+
+def _dims_match(dims, shape):
+    """ Whether the dimensions of a datashape describe a NumPy shape """
+    for i, dim in enumerate(dims):
+        if isinstance(dim, Ellipsis):
+            rest = dims[i + 1:]
+            return (len(shape) >= i + len(rest) and
+                    _dims_match(rest, shape[len(shape) - len(rest):]))
+        if i >= len(shape):
+            return False
+        if isinstance(dim, Fixed) and int(dim) != shape[i]:
+            return False
+    return len(dims) == len(shape)
+
+
+def _any_trailing(mask, ndim):
+    """ Reduce a boolean mask to its first ``ndim`` axes """
+    if mask.ndim > ndim:
+        return mask.any(axis=tuple(range(ndim, mask.ndim)))
+    return mask
+
+
+def _invalid_elements(measure, x):
+    """ A boolean mask the shape of ``x`` flagging elements of ``x`` that are
+    not valid instances of ``measure``
+    """
+    if x.dtype == object:
+        check = np.frompyfunc(compile_validator(measure), 1, 1)
+        return ~check(x).astype(bool)
+    if isinstance(measure, Option):
+        # NumPy's missing values (NaN, NaT) are valid values of the dtype
+        measure = measure.ty
+    if x.dtype.names is not None:
+        if isinstance(measure, Record):
+            fields = measure.fields
+        elif isinstance(measure, Tuple):
+            fields = list(zip(x.dtype.names, measure.dshapes))
+        else:
+            return np.ones(x.shape, dtype=bool)
+        if len(fields) != len(x.dtype.names):
+            return np.ones(x.shape, dtype=bool)
+        invalid = np.zeros(x.shape, dtype=bool)
+        for name, typ in fields:
+            if name not in x.dtype.names:
+                return np.ones(x.shape, dtype=bool)
+            column = x[name]
+            typ = dshape(typ)
+            if not _dims_match(typ.shape, column.shape[x.ndim:]):
+                return np.ones(x.shape, dtype=bool)
+            invalid |= _any_trailing(_invalid_elements(typ.measure, column),
+                                     x.ndim)
+        return invalid
+    if isinstance(measure, String) and x.dtype.kind in 'SU':
+        if measure.fixlen is None:
+            return np.zeros(x.shape, dtype=bool)
+        return np.char.str_len(x) > measure.fixlen
+    if (isinstance(measure, String) or
+            isinstance(measure, Categorical) and
+            isinstance(measure.type, String)):
+        # strings only come from string or object arrays
+        return np.ones(x.shape, dtype=bool)
+    try:
+        target = to_numpy_dtype(measure)
+    except (TypeError, NotImplementedError):
+        check = np.frompyfunc(compile_validator(measure), 1, 1)
+        return ~check(x).astype(bool)
+    if target.names is not None or target.kind == 'O' or x.dtype.kind in 'SU':
+        # records must come from structured arrays, strings from strings and
+        # Python objects from object arrays
+        return np.ones(x.shape, dtype=bool)
+    if (x.dtype.kind == 'b') != (target.kind == 'b'):
+        # booleans are not numbers, as in ``compile_validator``
+        return np.ones(x.shape, dtype=bool)
+    if x.dtype.kind in 'Mm' and x.dtype.kind == target.kind:
+        # any unit of the same kind of datetime64 or timedelta64
+        return np.zeros(x.shape, dtype=bool)
+    if x.dtype.kind in 'iu' and target.kind == 'f':
+        # integers that the float type holds exactly, which NumPy's casting
+        # rules do not check (int64 casts "safely" to float64)
+        bits = 8 * x.dtype.itemsize - (x.dtype.kind == 'i')
+        if np.finfo(target).nmant + 1 >= bits:
+            return np.zeros(x.shape, dtype=bool)
+        with np.errstate(invalid='ignore', over='ignore'):
+            y = x.astype(target)
+            # rounding up to 2 ** bits may saturate back to the integer
+            return (y >= 2.0 ** bits) | (y.astype(x.dtype) != x)
+    if np.can_cast(x.dtype, target, casting='safe'):
+        return np.zeros(x.shape, dtype=bool)
+    if x.dtype.kind in 'iu' and target.kind in 'iu':
+        info = np.iinfo(target)
+        return (x < info.min) | (x > info.max)
+    if x.dtype.kind == 'f' and target.kind == 'f':
+        return np.isfinite(x) & (np.abs(x) > np.finfo(target).max)
+    return np.ones(x.shape, dtype=bool)
+
+
+class RowError(namedtuple('RowError', 'row path expected value')):
+    """ A value in a sequence of rows that does not conform to a schema
+
+    Attributes
+    ----------
+    row : int
+        The index of the row holding the value.
+    path : tuple
+        The field names and positions leading from the row to the value.
+    expected : DataShape
+        The datashape the value should conform to.
+    value : object
+        The invalid value.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return 'row %d, path: _%s: expected %s, got %r' % (
+            self.row,
+            ''.join('[%d]' % p if isinstance(p, _inttypes) else '.%s' % p
+                    for p in self.path),
+            self.expected,
+            self.value,
+        )
+
+
+def iter_errors(schema, rows, max_errors=None):
+    """ Lazily validate an iterable of rows, generating a ``RowError`` for
+    each invalid value
+
+    ``schema`` is the schema of a single row or of the whole sequence, in
+    which case its leading dimension is dropped.  Rows are checked with a
+    compiled validator and only invalid rows are inspected further, so valid
+    data is validated quickly and in constant memory.  Stops after
+    ``max_errors`` errors if given.
+
+    >>> rows = iter([{'name': 'Alice', 'amount': 100},
+    ...              {'name': 'Bob', 'amount': 'many'},
+    ...              {'name': None, 'amount': None}])
+    >>> for error in iter_errors('var * {name: string, amount: ?int64}', rows):
+    ...     print(error)
+    row 1, path: _.amount: expected ?int64, got 'many'
+    row 2, path: _.name: expected string, got None
+    """
+    schema = dshape(schema)
+    if schema.shape:
+        schema = schema.subarray(1)
+    # Validators of the schema and its parts, compiled once for all rows
+    validators = {schema: compile_validator(schema)}
+    is_valid = validators[schema]
+    errors = (RowError(i, path, expected, value)
+              for i, row in enumerate(rows) if not is_valid(row)
+              for path, expected, value in _invalid_paths(schema, row, (),
+                                                          validators))
+    return islice(errors, max_errors)
+
+
+def find_errors(schema, rows, max_errors=10):
+    """ The first ``max_errors`` invalid values in an iterable of rows
+
+    See Also
+    --------
+    iter_errors
+    """
+    return list(iter_errors(schema, rows, max_errors=max_errors))
+
+
+def _invalid_paths(schema, value, path, validators):
+    """ Generate ``(path, datashape, value)`` triples for the innermost
+    invalid parts of ``value``
+
+    ``validators`` maps schemas to their compiled validators and is filled in
+    as new parts of the schema are reached.
+    """
+    try:
+        is_valid = validators[schema]
+    except KeyError:
+        is_valid = validators[schema] = compile_validator(schema)
+    if is_valid(value):
+        return
+    if schema.shape:
+        dim = schema[0]
+        if (isinstance(value, (tuple, list)) and
+                isinstance(dim, (Fixed, Var, TypeVar)) and
+                (not isinstance(dim, Fixed) or int(dim) == len(value))):
+            subschema = schema.subarray(1)
+            for i, item in enumerate(value):
+                for error in _invalid_paths(subschema, item, path + (i,),
+                                            validators):
+                    yield error
+            return
+    else:
+        measure = schema.measure
+        if isinstance(measure, Option) and value is not None:
+            measure = measure.ty
+        if isinstance(measure, Record):
+            if isinstance(value, dict):
+                items = [(name, typ, value.get(name))
+                         for name, typ in measure.fields]
+            elif (isinstance(value, (tuple, list)) and
+                    len(value) == len(measure.fields)):
+                items = [(name, typ, item)
+                         for (name, typ), item in zip(measure.fields, value)]
+            else:
+                items = None
+        elif (isinstance(measure, Tuple) and
+                isinstance(value, (tuple, list)) and
+                len(value) == len(measure.dshapes)):
+            items = [(i, typ, item)
+                     for i, (typ, item) in enumerate(zip(measure.dshapes,
+                                                         value))]
+        else:
+            items = None
+        if items is not None:
+            for key, typ, item in items:
+                for error in _invalid_paths(dshape(typ), item, path + (key,),
+                                            validators):
+                    yield error
+            return
+    yield path, schema, value
+
+
+# Chunk validators compiled in pool workers, keyed by a token per call
+_chunk_validators = {}
+_chunk_tokens = count()
+
+
+def _chunk_validator(schema, isarray):
+    if isarray:
+        return partial(validate_array, schema)
+    is_valid = compile_validator(schema)
+    return lambda rows: np.fromiter(
+        (not is_valid(row) for row in rows), dtype=bool, count=len(rows),
+    )
+
+
+def _validate_chunk(token, schema, isarray, chunk):
+    try:
+        validator = _chunk_validators[token]
+    except KeyError:
+        # The first chunk of this call that reaches the worker
+        validator = _chunk_validators[token] = _chunk_validator(schema,
+                                                                isarray)
+    return validator(chunk)
+
+
+def _chunks(data, chunksize):
+    if isinstance(data, np.ndarray):
+        return (data[i:i + chunksize] for i in range(0, len(data), chunksize))
+    it = iter(data)
+    return iter(lambda: list(islice(it, chunksize)), [])
+
+
+def validate_parallel(schema, data, chunksize=100000, max_workers=None,
+                      threads=False):
+    """ Validate the rows of a large sequence or array in parallel
+
+    ``data`` is split into chunks of ``chunksize`` rows which are validated
+    on a pool of ``max_workers`` processes, or threads if ``threads`` is
+    true.  The schema is compiled once in each worker, when the first chunk
+    reaches it.  Arrays are validated with ``validate_array`` and other
+    iterables row by row with ``compile_validator``.
+
+    ``schema`` describes the whole of ``data``.  Returns a boolean mask that
+    is ``True`` for invalid rows, in the order of ``data``.
+
+    >>> mask = validate_parallel('var * {x: int64}',
+    ...                          [{'x': 1}, {'x': 'a'}, {'x': 3}],
+    ...                          chunksize=2, threads=True)
+    >>> mask
+    array([False,  True, False])
+    >>> np.flatnonzero(mask)
+    array([1])
+
+    See Also
+    --------
+    validate_array
+    iter_errors
+    """
+    # Imported here since concurrent.futures is not available on Python 2
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    schema = dshape(schema)
+    if not schema.shape:
+        raise TypeError('schema %s has no dimension to split into chunks' %
+                        schema)
+    isarray = isinstance(data, np.ndarray)
+    if isinstance(schema[0], Fixed):
+        try:
+            n = len(data)
+        except TypeError:
+            pass
+        else:
+            if n != int(schema[0]):
+                return np.ones(n, dtype=bool)
+    if isarray:
+        # every chunk is validated against the full schema, bar its length
+        chunkschema = DataShape(var, *schema.parameters[1:])
+    else:
+        chunkschema = schema.subarray(1)
+
+    token = next(_chunk_tokens)
+    pool = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    try:
+        # The pool's initializer would need Python 3.7, so the schema comes
+        # with every chunk and is compiled on first use
+        with pool(max_workers=max_workers) as executor:
+            masks = list(executor.map(_validate_chunk,
+                                      repeat(token),
+                                      repeat(chunkschema),
+                                      repeat(isarray),
+                                      _chunks(data, chunksize)))
+    finally:
+        _chunk_validators.pop(token, None)
+    if not masks:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(masks)
@@ -102,7 +102,7 @@ def assert_dshape_equal(a, b, check_dim=True, path=None, **kwargs):
 class Slotted(with_metaclass(ABCMeta)):
     @classmethod
     def __subclasshook__(cls, subcls):
-        return hasattr(subcls, '__slots__')
+        return getattr(subcls, '_parameter_slots', None) is not None
 
 
 @assert_dshape_equal.register(Slotted, Slotted)
@@ -110,12 +110,13 @@ def _check_slots(a, b, path=None, **kwargs):
     if type(a) != type(b):
         return _base_case(a, b, path=path, **kwargs)
 
-    assert a.__slots__ == b.__slots__, 'slots mismatch: %r != %r\n%s' % (
-        a.__slots__, b.__slots__, _fmt_path(path),
-    )
+    assert a._parameter_slots == b._parameter_slots, \
+        'slots mismatch: %r != %r\n%s' % (
+            a._parameter_slots, b._parameter_slots, _fmt_path(path),
+        )
     if path is None:
         path = ()
-    for slot in a.__slots__:
+    for slot in a._parameter_slots:
         assert getattr(a, slot) == getattr(b, slot), \
             "%s %ss do not match: %r != %r\n%s" % (
                 type(a).__name__.lower(),
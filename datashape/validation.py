@@ -53,8 +53,34 @@ def validate(ds):
     Traceback (most recent call last):
         ...
     DataShapeSyntaxError: Expected a dtype
+    >>> dshape('{a: ... * ... * int32}') # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    TypeError: Can only use a single wildcard
+
+    Datashapes are immutable, so each one is only validated once.  Validating
+    it again, or a datashape built from it, skips the validated parts.
     """
-    traverse(_validate, ds)
+    # Anything that is not a Mono, and every Unit, has nothing to validate
+    if not isinstance(ds, T.Mono) or getattr(ds, '_validated', False):
+        return
+    params = ds.parameters
+    for p in params:
+        if isinstance(p, (tuple, list)):
+            # e.g. the (name, type) fields of a Record
+            _validate_all(p)
+        else:
+            validate(p)
+    _validate(ds, params)
+    ds._validated = True
+
+
+def _validate_all(params):
+    for p in params:
+        if isinstance(p, (tuple, list)):
+            _validate_all(p)
+        else:
+            validate(p)
 
 
 def _validate(ds, params):